@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Author: Madeleine NICOLAS
+        madeleine.nicolas@univ-rennes1.fr
+
+Purpose: Calendar tools shared by HydMod and SMBM (aggregation periods, crop seasons and crop calendars)
+
+Requirements: Daily dates of the model run
+
+Remarks: Kharif season runs from June to October, Rabi from November to May of the following year;
+         a Rabi season is labelled with the year it starts in
+
+Date:   October 2026
+"""
+
+import numpy as np
+import pandas as pd
+
+########## CROP SEASONS ##########
+
+KharifMonths = [6, 7, 8, 9, 10] # Months of the Kharif (monsoon) season, other months belong to Rabi
+
+# Crop calendar per land use: a constant or a list of (start (month, day), end (month, day), value) stages,
+# applied in order (a later stage overrides an earlier one on shared days); days without a stage are NaN
+CropCalendar = {
+    
+    # Crop coefficient Kc
+    'Kc': {'Scrub': 0.7, 'Forest': 1.2, 'Fruit': 0.8, 'Tank': 1, 'Urban': 1,
+           'Vegetable': [((6,1),(6,30),0.95), ((7,1),(7,31),0.7), ((8,1),(11,25),1.05), ((11,26),(12,31),0.95), # Kharif
+                         ((1,1),(1,10),0.95), ((1,11),(2,10),0.7), ((2,11),(5,31),0.85)], # Rabi
+           'PaddyR': [((6,1),(6,30),1.05), ((7,1),(10,31),1.2), ((11,1),(11,15),1), ((11,16),(12,15),1.05), ((12,16),(12,31),1.2),
+                      ((1,1),(3,25),1.2), ((3,26),(5,31),1)],
+           'PaddyK': [((6,1),(6,30),1.05), ((7,1),(10,31),1.2), ((11,1),(12,31),1), ((1,1),(5,31),1)]},
+    
+    # Pumping PG (mm/day)
+    'PG': {'Scrub': 0, 'Forest': 0, 'Fruit': 1.9, 'Tank': 0, 'Urban': 0, 'Vegetable': 7.7,
+           'PaddyR': [((6,1),(6,30),10.1*0.1), # Nursery (Kharif)
+                      ((7,1),(9,30),10.1), # Irrigation (Kharif)
+                      ((10,1),(10,15),0), # Harvesting (Kharif)
+                      ((10,16),(12,15),15.2*0.1), # Maintenance + Nursery
+                      ((12,15),(12,31),15.2), ((1,1),(4,15),15.2), # Irrigation (Rabi)
+                      ((4,16),(4,30),0), # Harvesting (Rabi)
+                      ((5,1),(5,31),15.2*0.1)], # Maintenance + Nursery (Rabi)
+           'PaddyK': [((6,1),(6,30),10.1*0.1), # Nursery (Kharif)
+                      ((7,1),(9,30),10.1), # Irrigation (Kharif)
+                      ((10,1),(12,31),0), ((1,1),(5,31),0)]}, # Harvesting (Kharif) + No pumping
+    
+    # Part of recharge which is natural (the rest is return flow), Cf
+    'Cf': {'Scrub': 1, 'Forest': 1, 'Fruit': 1, 'Tank': 1, 'Urban': 1,
+           'Vegetable': [((1,1),(12,31),0.24), ((6,1),(10,31),0.26)], # Kharif
+           'PaddyR': [((6,1),(6,30),0.51), ((7,1),(9,30),0.51), # Nursery + Irrigation (Kharif)
+                      ((10,1),(10,15),1), # Harvesting (Kharif)
+                      ((10,16),(12,15),0.48), ((12,15),(12,31),0.48), ((1,1),(4,15),0.48), # Maintenance + Nursery, Irrigation (Rabi)
+                      ((4,16),(4,30),1), # Harvesting (Rabi)
+                      ((5,1),(5,31),0.48)], # Maintenance + Nursery (Rabi)
+           'PaddyK': [((6,1),(6,30),0.51), ((7,1),(9,30),0.51), # Nursery + Irrigation (Kharif)
+                      ((10,1),(12,31),1), ((1,1),(5,31),1)]}} # Harvesting (Kharif) + No pumping
+
+LeapMonthStart = np.cumsum([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30]) # First day of each month in a leap year calendar
+
+def Crop_compile_fun(Spec):
+    
+    """Compiles the crop calendar of one variable into day-of-year lookup arrays
+    
+    Inputs: dictionary {land use: constant or list of stages} (see CropCalendar)
+    
+    Outputs: dictionary {land use: array of 366 values} on a leap year calendar (day 59 is February 29th)
+    """
+    
+    Tables = {}
+    
+    for lu, Stages in Spec.items():
+        if np.isscalar(Stages):
+            Stages = [((1,1),(12,31),Stages)]
+        Tab = np.zeros(366) + np.nan
+        for (m1,d1), (m2,d2), Value in Stages:
+            Tab[LeapMonthStart[m1-1]+d1-1:LeapMonthStart[m2-1]+d2] = Value
+        Tables[lu] = Tab
+    
+    return(Tables)
+
+def Crop_daily_fun(Tables,Dates,LandUses,Columns=None):
+    
+    """Daily values of a compiled crop calendar
+    
+    Inputs: lookup arrays from Crop_compile_fun, daily dates, land use of each column, column names (default: land uses)
+    
+    Outputs: (days x columns) float DataFrame, NaN for land uses without calendar
+    
+    Remarks: dates are mapped on the leap year calendar so that a given day and month has the same value every year
+    """
+    
+    Dates = pd.DatetimeIndex(pd.to_datetime(Dates))
+    Day = LeapMonthStart[np.asarray(Dates.month) - 1] + np.asarray(Dates.day) - 1
+    Missing = np.zeros(366) + np.nan
+    Mat = np.array([Tables.get(lu,Missing) for lu in LandUses]).reshape(-1,366).T
+    
+    return(pd.DataFrame(Mat[Day],index=Dates,columns=list(LandUses) if Columns is None else Columns))
+
+########## AGGREGATION PERIODS ##########
+
+def Period_fun(Dates,Freq):
+
+    """Assigns each day to an aggregation period
+
+    Inputs: daily dates, frequency 'A' (yearly), 'M' (monthly) or 'S' (Kharif/Rabi crop seasons)
+
+    Outputs: period number of each day (0 to number of periods - 1) and period labels
+    (years, monthly periods or season names such as 'Kharif 2002')
+    """
+
+    Dates = pd.DatetimeIndex(pd.to_datetime(Dates))
+    Year = np.asarray(Dates.year)
+    Month = np.asarray(Dates.month)
+
+    if Freq == 'A':
+        Keys = Year
+    elif Freq == 'M':
+        Keys = Year*12 + Month - 1
+    elif Freq == 'S':
+        Kharif = np.isin(Month,KharifMonths)
+        SeasonYear = Year - (Month < min(KharifMonths)) # Jan to May belong to the Rabi season of the previous year
+        Keys = SeasonYear*2 + ~Kharif
+    else:
+        raise ValueError("Unknown frequency '%s', use 'A', 'M' or 'S'" % Freq)
+
+    Keys, Codes = np.unique(Keys,return_inverse=True)
+
+    if Freq == 'A':
+        Labels = pd.Index(Keys)
+    elif Freq == 'M':
+        Labels = pd.PeriodIndex([pd.Period(year=k//12,month=k%12+1,freq='M') for k in Keys])
+    else:
+        Labels = pd.Index([('Rabi %d' if k % 2 else 'Kharif %d') % (k//2) for k in Keys])
+
+    return(Codes.astype(np.int64),Labels)
+
+def Periods_fun(Dates,Freqs):
+
+    """Period numbers for several frequencies at once
+
+    Inputs: daily dates, list of frequencies (see Period_fun)
+
+    Outputs: (frequencies x days) array of period numbers and list of period labels per frequency
+    """
+
+    Periods = [Period_fun(Dates,Freq) for Freq in Freqs]
+    Codes = np.array([p[0] for p in Periods],dtype=np.int64).reshape(len(Freqs),len(Dates))
+
+    return(Codes,[p[1] for p in Periods])
@@ -1,152 +1,883 @@
-# -*- coding: utf-8 -*-
-"""
-Author: Madeleine NICOLAS       
-        madeleine.nicolas@univ-rennes1.fr
-
-Purpose: Physically based soil moisture model based on Dewandel et al., 2008 used in HydModel_apply
-
-Requirements: Input ETR, R and PG data; hydraulic parameters 
-
-Remarks: 
-
-Date:   April 2018
-"""
-
-import numpy as np
-import pandas as pd
-
-########## HYDRAULIC MODEL ##########
-
-def HydMod_fun(Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,InputData):
-    
-    """Physically based hydraulic model to calculate recharge
-    
-    Inputs: Dataframe containing Potential Evapotranspiration (PET), Rainfall (R), 
-    Pumping (PG), and Real Evapotranspiration (RET) at a daily time-step
-    
-    Outputs: Dataframe containing different components of hydraulic model (namely qout) at a daily time-step
-    """
-  
-    #OutputData = pd.DataFrame()
-    OutputData = pd.DataFrame(0.0,index=InputData.index, columns=['Rd','Runoff','Theta1','hUnsat','Kh','qh','Theta2','hs','qs','qout','DeltaS','Deficit','AET']).reset_index()
-    
-    for i in range(1,len(OutputData)):
-        
-        # Flux entering field at beggining of timestep (Rd)
-        if 'PG' in InputData.columns:
-            Rdbis = InputData['PG'][i] + InputData['R'][i] + OutputData['DeltaS'][i-1] * (OutputData['DeltaS'][i-1]>=0)
-        else: 
-            Rdbis = InputData['R'][i] + OutputData['DeltaS'][i-1] * (OutputData['DeltaS'][i-1]>=0)
-            
-        if Rdbis <= Thresh:
-            OutputData.at[i,'Rd'] = Rdbis
-            OutputData.at[i,'Runoff'] = 0
-        else:
-            OutputData.at[i,'Rd'] = Thresh
-            OutputData.at[i,'Runoff'] = Rdbis-Thresh
-            
-        # Soil moisture at beggining of timestep (Theta1)
-        Theta1bis = OutputData['Theta2'][i-1]+(OutputData['Rd'][i]-InputData['RET'][i])/SoilThick
-        if  Theta1bis >= ThetaS:
-            OutputData.at[i,'Theta1'] = ThetaS
-        elif Theta1bis > 0:        
-            OutputData.at[i,'Theta1'] = Theta1bis
-        else:
-            OutputData.at[i,'Theta1'] = 1E-10 # To allow calculation of hUnsat..?
-        
-        # Hydraulic pressure in unsaturated zone (hUnsat) (Brooks and Corey)
-        if OutputData['Theta1'][i] > 0:
-            OutputData.at[i,'hUnsat'] = hbc*np.power((ThetaS/OutputData['Theta1'][i]),(1/Lambda)) #in m
-            
-        # Unsaturated hydraulic conductivity (Kh) (Brooks and Corey)
-        if OutputData['Theta1'][i] < ThetaS:
-           OutputData.at[i,'Kh'] = Ks*np.power((OutputData['Theta1'][i]/ThetaS),Eta) #in m/day
-        
-        # Flux from unsaturated zone (qh)
-        qmax = OutputData['Rd'][i] - InputData['RET'][i] + OutputData['Theta2'][i-1]*SoilThick
-        qhbis = -OutputData['Kh'][i]*(OutputData['hUnsat'][i]/SoilThick-1)
-        if (OutputData['Kh'][i] > 0):
-            if (qhbis < qmax):
-                OutputData.at[i,'qh'] = qhbis
-            elif qmax > 0:
-                OutputData.at[i,'qh'] = qmax
-        
-        # Saturated thickness (hs)
-        if OutputData['Theta1'][i] == ThetaS:
-           OutputData.at[i,'hs'] = OutputData['Rd'][i] - InputData['RET'][i] - (ThetaS - OutputData['Theta2'][i-1]) * SoilThick + SoilThick
-        
-        # Flux from saturated zone (qs)
-        qsbis = (OutputData['hs'][i])/SoilThick*Ks
-        if (OutputData['qh'][i] == 0) & (OutputData['Theta1'][i] == ThetaS) & (OutputData['hs'][i] >= 0):
-            if qsbis <= qmax:
-                OutputData.at[i,'qs'] = qsbis
-            elif qsbis > qmax:
-                OutputData.at[i,'qs'] = qmax
-                
-        # Total outflow  (qout)
-        OutputData.at[i,'qout'] = OutputData['qs'][i] + OutputData['qh'][i]
-        
-        # Saturated media budget (DeltaS)
-        if (OutputData['qh'][i] == 0) & (OutputData['qs'][i] >= 0):
-            OutputData.at[i,'DeltaS'] = OutputData['Rd'][i] - InputData['RET'][i] - (ThetaS - OutputData['Theta2'][i-1])*SoilThick - OutputData['qout'][i]
-            
-        # Soil moisture at end of timestep (Theta2)
-        Theta2_1 = 0
-        if (OutputData['qh'][i] >= 0) & (OutputData['Theta1'][i] < ThetaS): # If media is unsaturated
-            Theta2_1 = OutputData['Theta1'][i] - OutputData['qh'][i]/SoilThick 
-        
-        Theta2_2bis = OutputData['Theta1'][i] + (OutputData['Rd'][i] - InputData['RET'][i] - (ThetaS - OutputData['Theta2'][i-1])*SoilThick - OutputData['qout'][i])/SoilThick
-        
-        if (Theta2_1 == 0)  & (OutputData['qs'][i] >= 0) & (OutputData['Theta1'][i] == ThetaS) & (Theta2_2bis > 0) & (OutputData['DeltaS'][i] < 0):  # If media is saturated
-            Theta2_2 = Theta2_2bis
-        else:
-            Theta2_2 = 1E-10
-            
-        if (Theta2_1 == 0)  & (OutputData['qs'][i] >= 0) & (OutputData['Theta1'][i] == ThetaS) & (OutputData['DeltaS'][i] >= 0):
-            Theta2_2 += ThetaS - 1E-10            
-        
-        if (Theta2_1 >= 0) & (Theta2_2 >= 0):
-            OutputData.at[i,'Theta2'] = Theta2_1 + Theta2_2
-        else:
-            OutputData.at[i,'Theta2'] = 0
-            
-        # Soil moisture deficit
-        if (OutputData['Theta1'][i] == 1E-10) & (Theta1bis < 0):
-            OutputData.at[i,'Deficit'] = -(OutputData['Theta2'][i-1]*SoilThick + OutputData['Rd'][i]- InputData['RET'][i])
-        
-        # Actual evapotranspiration
-        OutputData.at[i,'AET'] = InputData['RET'][i] - OutputData['Deficit'][i]
-         
-    return(OutputData)   
-    
-### APPLICATION EXAMPLE
-#
-### Inputs
-#import HydModel_FineGrid_inputs_THESE as HydModel_inputs
-#
-#InputClimate = HydModel_inputs.InputClimate
-#InputPG = HydModel_inputs.InputPG 
-#InputPG_Yrly = InputPG.resample("A").sum()
-#InputPG_Yrly.index = InputPG_Yrly.index.year
-#InputRET = HydModel_inputs.InputRET
-#InputCf = HydModel_inputs.InputCf 
-#    
-### hE
-#Thresh = 0.03
-#Ks = np.multiply(1.21E-05,86400) # Saturated Hydraulic conductivity (m/s)
-#ThetaS = 0.35 # Saturated soil moisture content (m3/m3)
-#Lambda = 0.129 # Pore-size-distribution parameter
-#hbc = -0.06 # Air-entry pressure head (m)
-#Eta = 19.3 # Texture-dependent conductivity shape parameter
-#SoilThick = 0.4 # Soil thickness(m)
-#
-#HydMod_fun(Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,InputData)
-#
-### hB
-#Ks2 = np.multiply(1.08E-5,86400)
-#ThetaS2 =  0.35
-#Lambda2 = 0.096
-#hbc2 = -0.123
-#Eta2 = 24.1
-#SoilThick2 = 1.13 # Soil thickness (hB) (m)
-
+# -*- coding: utf-8 -*-
+"""
+Author: Madeleine NICOLAS       
+        madeleine.nicolas@univ-rennes1.fr
+
+Purpose: Physically based soil moisture model based on Dewandel et al., 2008 used in HydModel_apply
+
+Requirements: Input ETR, R and PG data; hydraulic parameters 
+
+Remarks: 
+
+Date:   April 2018
+"""
+
+import os
+import hashlib
+import tempfile
+import warnings
+import itertools
+import string
+import numpy as np
+import pandas as pd
+from Calendar_def import Periods_fun, CropCalendar, Crop_compile_fun, Crop_daily_fun
+
+try: # Optional compiled backend
+    import numba
+except ImportError:
+    numba = None
+
+HydModBackend = 'numba' if numba is not None else 'numpy' # Backend used by HydMod_fun and the category/column engines, both give identical results
+
+def HydMod_set_backend(name):
+    
+    """Selects the backend of the hydraulic model: 'numba' (compiled, parallel over categories, default when installed) or 'numpy'
+    """
+    
+    global HydModBackend
+    if name not in ('numba','numpy'):
+        raise ValueError("Unknown backend '%s', use 'numba' or 'numpy'" % name)
+    if (name == 'numba') & (numba is None):
+        raise ImportError("numba is not installed, only the 'numpy' backend is available")
+    HydModBackend = name
+
+HydModPrecision = 'float64' # Dtype of the daily output tables built by HydMod_frame
+HydModPrecisionTol = 1E-4 # Largest relative deviation of yearly totals accepted in 'float32'
+
+def HydMod_set_precision(Mode='float64',Tol=1E-4):
+
+    """Selects the dtype of the daily output tables: 'float64' (default) or 'float32' (half the memory and file size),
+    Tol is the largest relative deviation of yearly totals accepted in 'float32'
+    """
+
+    global HydModPrecision, HydModPrecisionTol
+    if Mode not in ('float64','float32'):
+        raise ValueError("Unknown precision '%s', use 'float64' or 'float32'" % Mode)
+    if not (0 < Tol < 1):
+        raise ValueError("Precision tolerance must be between 0 and 1")
+    HydModPrecision = Mode
+    HydModPrecisionTol = Tol
+
+def HydMod_frame(Values,Index=None,Columns=None,Precision=None):
+
+    """Daily output table with the numeric dtype of HydMod_set_precision
+
+    Inputs: (days x categories) values, dates as index, column names,
+    Precision overrides HydModPrecision for this table (e.g. 'float64' for hUnsat, whose values overflow float32)
+
+    Outputs: DataFrame in Precision (HydModPrecision by default)
+
+    Remarks: in 'float32', yearly totals are compared with the float64 values and the table is kept in float64
+    if any deviates by more than HydModPrecisionTol (relative to the largest yearly total of its column)
+    """
+
+    if Precision is None:
+        Precision = HydModPrecision
+    elif Precision not in ('float64','float32'):
+        raise ValueError("Unknown precision '%s', use 'float64' or 'float32'" % Precision)
+
+    Values = np.asarray(Values,dtype=float)
+    Out = Values.astype(Precision)
+
+    if (Precision == 'float32') and isinstance(Index,pd.DatetimeIndex) and (len(Index) > 0):
+        Years = np.asarray(Index.year)
+        Starts = np.flatnonzero(np.r_[True,Years[1:] != Years[:-1]])
+        Tot64 = np.add.reduceat(Values,Starts,axis=0)
+        Tot32 = np.add.reduceat(Out.astype(float),Starts,axis=0)
+        Scale = np.maximum(np.abs(Tot64).max(axis=0),1E-12)
+        Dev = np.nanmax(np.abs(Tot32 - Tot64)/Scale) if Values.size else 0
+        if Dev > HydModPrecisionTol:
+            warnings.warn('float32 yearly totals deviate by %.2e (tolerance %.0e), table kept in float64' % (Dev,HydModPrecisionTol),RuntimeWarning)
+            Out = Values
+
+    return(pd.DataFrame(Out,index=Index,columns=Columns))
+
+########## HYDRAULIC MODEL ##########
+
+HydModColumns = ['Rd','Runoff','Theta1','hUnsat','Kh','qh','Theta2','hs','qs','qout','DeltaS','Deficit','AET'] # Order of rows in kernel outputs
+
+def HydMod_kernel(Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,R,PG,RET,Out,State,Start,SnapDays,Snap):
+    
+    """Daily recursion of the hydraulic model on plain arrays (no pandas access inside the loop)
+    
+    Inputs: hydraulic parameters (scalars), Rainfall (R), Pumping (PG) and Real Evapotranspiration (RET)
+    as 1D float arrays (m), preallocated zero array Out of shape (13 x days), 
+    State [Theta2, DeltaS] before day Start (first simulated day), sorted days SnapDays at which the state is saved
+    and preallocated Snap of shape (snapshots x 2)
+    
+    Outputs: Out is filled in place, rows follow HydModColumns; State holds the final state
+    and Snap the state at the beginning of each of the SnapDays
+    """
+    
+    Theta2prev = State[0] # Only Theta2 and DeltaS are carried from one day to the next
+    DeltaSprev = State[1]
+    s = 0
+    
+    ## Brooks-Corey terms of the two clamped states, Theta1 = 1E-10 (deficit, most dry-season days) and Theta1 = ThetaS
+    ## np.float_power evaluates the C library pow in numpy and numba alike (vectorized np.power may differ in the last bit)
+    hDry = hbc*np.float_power((ThetaS/1E-10),(1/Lambda))
+    KDry = 0.0
+    if 1E-10 < ThetaS:
+        KDry = Ks*np.float_power((1E-10/ThetaS),Eta)
+    hSat = hbc*np.float_power((ThetaS/ThetaS),(1/Lambda))
+    
+    ## Dry days: once a day ends in deficit (Theta2 = 2E-10, DeltaS < 0), a day below Thresh where Theta1 stays clamped
+    ## at 1E-10 and nothing drains takes the same branches again and ends in the same state,
+    ## so runs of such days are filled directly (same operations, same results) without going through the branches below
+    qhbisDry = -KDry*(hDry/SoilThick-1)
+    
+    i = Start
+    while i < len(R):
+        
+        if s < len(SnapDays): # Snapshot of the state before day i
+            if SnapDays[s] == i:
+                Snap[s,0] = Theta2prev
+                Snap[s,1] = DeltaSprev
+                s += 1
+        
+        End = i # Run of dry days [i,End) stops at the next wet day or snapshot
+        if (Theta2prev == 2E-10) & (DeltaSprev < 0) & (1E-10 < ThetaS):
+            Stop = len(R)
+            if s < len(SnapDays):
+                Stop = max(SnapDays[s],i+1)
+            while End < Stop:
+                Rd = PG[End] + R[End]
+                qmax = Rd - RET[End] + 2E-10*SoilThick
+                DeltaS = Rd - RET[End] - (ThetaS - 2E-10)*SoilThick
+                if not ((Rd <= Thresh) & (2E-10 + (Rd - RET[End])/SoilThick < 0) & (DeltaS < 0)): # Also stops at missing values
+                    break
+                if (KDry > 0) & ((qhbisDry < qmax) | (qmax > 0)): # Flux from unsaturated zone
+                    break
+                Out[0,End] = Rd
+                Out[1,End] = 0.0
+                Out[2,End] = 1E-10
+                Out[3,End] = hDry
+                Out[4,End] = KDry
+                Out[5,End] = 0.0
+                Out[6,End] = 2E-10
+                Out[7,End] = 0.0
+                Out[8,End] = 0.0
+                Out[9,End] = 0.0
+                Out[10,End] = DeltaS
+                Out[11,End] = -(2E-10*SoilThick + Rd - RET[End])
+                Out[12,End] = RET[End] - Out[11,End]
+                DeltaSprev = DeltaS
+                End += 1
+        if End > i:
+            i = End
+            continue
+        
+        # Flux entering field at beggining of timestep (Rd)
+        Rdbis = PG[i] + R[i] + DeltaSprev * (DeltaSprev>=0)
+        
+        if Rdbis <= Thresh:
+            Rd = Rdbis
+            Runoff = 0.0
+        else:
+            Rd = Thresh
+            Runoff = Rdbis-Thresh
+            
+        # Soil moisture at beggining of timestep (Theta1)
+        Theta1bis = Theta2prev+(Rd-RET[i])/SoilThick
+        if  Theta1bis >= ThetaS:
+            Theta1 = ThetaS
+        elif Theta1bis > 0:        
+            Theta1 = Theta1bis
+        else:
+            Theta1 = 1E-10 # To allow calculation of hUnsat..?
+        
+        # Hydraulic pressure in unsaturated zone (hUnsat) and unsaturated hydraulic conductivity (Kh) (Brooks and Corey)
+        hUnsat = 0.0
+        Kh = 0.0
+        if Theta1 == 1E-10: # Same values as below without the power functions
+            hUnsat = hDry
+            Kh = KDry
+        elif Theta1 == ThetaS:
+            hUnsat = hSat
+        else:
+            if Theta1 > 0:
+                hUnsat = hbc*np.float_power((ThetaS/Theta1),(1/Lambda)) #in m
+            if Theta1 < ThetaS:
+                Kh = Ks*np.float_power((Theta1/ThetaS),Eta) #in m/day
+        
+        # Flux from unsaturated zone (qh)
+        qmax = Rd - RET[i] + Theta2prev*SoilThick
+        qhbis = -Kh*(hUnsat/SoilThick-1)
+        qh = 0.0
+        if (Kh > 0):
+            if (qhbis < qmax):
+                qh = qhbis
+            elif qmax > 0:
+                qh = qmax
+        
+        # Saturated thickness (hs)
+        hs = 0.0
+        if Theta1 == ThetaS:
+            hs = Rd - RET[i] - (ThetaS - Theta2prev) * SoilThick + SoilThick
+        
+        # Flux from saturated zone (qs)
+        qsbis = hs/SoilThick*Ks
+        qs = 0.0
+        if (qh == 0) & (Theta1 == ThetaS) & (hs >= 0):
+            if qsbis <= qmax:
+                qs = qsbis
+            elif qsbis > qmax:
+                qs = qmax
+                
+        # Total outflow  (qout)
+        qout = qs + qh
+        
+        # Saturated media budget (DeltaS)
+        DeltaS = 0.0
+        if (qh == 0) & (qs >= 0):
+            DeltaS = Rd - RET[i] - (ThetaS - Theta2prev)*SoilThick - qout
+            
+        # Soil moisture at end of timestep (Theta2)
+        Theta2_1 = 0.0
+        if (qh >= 0) & (Theta1 < ThetaS): # If media is unsaturated
+            Theta2_1 = Theta1 - qh/SoilThick 
+        
+        Theta2_2bis = Theta1 + (Rd - RET[i] - (ThetaS - Theta2prev)*SoilThick - qout)/SoilThick
+        
+        if (Theta2_1 == 0)  & (qs >= 0) & (Theta1 == ThetaS) & (Theta2_2bis > 0) & (DeltaS < 0):  # If media is saturated
+            Theta2_2 = Theta2_2bis
+        else:
+            Theta2_2 = 1E-10
+            
+        if (Theta2_1 == 0)  & (qs >= 0) & (Theta1 == ThetaS) & (DeltaS >= 0):
+            Theta2_2 += ThetaS - 1E-10            
+        
+        if (Theta2_1 >= 0) & (Theta2_2 >= 0):
+            Theta2 = Theta2_1 + Theta2_2
+        else:
+            Theta2 = 0.0
+            
+        # Soil moisture deficit
+        Deficit = 0.0
+        if (Theta1 == 1E-10) & (Theta1bis < 0):
+            Deficit = -(Theta2prev*SoilThick + Rd- RET[i])
+        
+        # Actual evapotranspiration
+        AET = RET[i] - Deficit
+        
+        ## Store data
+        Out[0,i] = Rd
+        Out[1,i] = Runoff
+        Out[2,i] = Theta1
+        Out[3,i] = hUnsat
+        Out[4,i] = Kh
+        Out[5,i] = qh
+        Out[6,i] = Theta2
+        Out[7,i] = hs
+        Out[8,i] = qs
+        Out[9,i] = qout
+        Out[10,i] = DeltaS
+        Out[11,i] = Deficit
+        Out[12,i] = AET
+        
+        Theta2prev = Theta2
+        DeltaSprev = DeltaS
+        i += 1
+    
+    State[0] = Theta2prev
+    State[1] = DeltaSprev
+         
+    return(Out)
+
+########## COMPILED HYDRAULIC MODEL (OPTIONAL) ##########
+
+if numba is not None:
+    
+    # Compiled on first call, signatures are cached on disk so later sessions skip compilation
+    HydMod_kernel_jit = numba.njit(cache=True, error_model='numpy')(HydMod_kernel)
+
+def HydMod_fun(Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,InputData):
+    
+    """Physically based hydraulic model to calculate recharge
+    
+    Inputs: Dataframe containing Potential Evapotranspiration (PET), Rainfall (R), 
+    Pumping (PG), and Real Evapotranspiration (RET) at a daily time-step
+    
+    Outputs: Dataframe containing different components of hydraulic model (namely qout) at a daily time-step
+    """
+    
+    R = np.asarray(InputData['R'],dtype=float)
+    RET = np.asarray(InputData['RET'],dtype=float)
+    if 'PG' in InputData.columns:
+        PG = np.asarray(InputData['PG'],dtype=float)
+    else: 
+        PG = np.zeros(len(R))
+    
+    Out = np.zeros((len(HydModColumns),len(R)))
+    Args = [Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,R,PG,RET,Out,np.zeros(2),1,np.zeros(0,dtype=np.int64),np.zeros((0,2))]
+    if HydModBackend == 'numba':
+        HydMod_kernel_jit(*Args)
+    else:
+        HydMod_kernel(*Args)
+    
+    OutputData = pd.DataFrame(dict(zip(HydModColumns,Out)),index=InputData.index,columns=HydModColumns).reset_index()
+         
+    return(OutputData)   
+    
+########## CATEGORY-VECTORIZED HYDRAULIC MODEL ##########
+
+def HydMod_step(Theta2prev,DeltaSprev,Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,R,PG,RET):
+    
+    """Single daily step of the hydraulic model for all categories at once
+    
+    Inputs: Theta2 and DeltaS at end of previous day, hydraulic parameters, R, PG and RET for the day
+    (all arrays of length categories, or scalars)
+    
+    Outputs: tuple of arrays in the order of HydModColumns; the branches of HydMod_kernel are replaced by masks
+    """
+    
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore', under='ignore'):
+        
+        # Flux entering field at beggining of timestep (Rd)
+        Rdbis = PG + R + DeltaSprev * (DeltaSprev>=0)
+        Rd = np.where(Rdbis <= Thresh, Rdbis, Thresh)
+        Runoff = np.where(Rdbis <= Thresh, 0.0, Rdbis-Thresh)
+        
+        # Soil moisture at beggining of timestep (Theta1)
+        Theta1bis = Theta2prev+(Rd-RET)/SoilThick
+        Theta1 = np.where(Theta1bis >= ThetaS, ThetaS, np.where(Theta1bis > 0, Theta1bis, 1E-10))
+        
+        # Hydraulic pressure (hUnsat) and unsaturated hydraulic conductivity (Kh) (Brooks and Corey)
+        hUnsat = np.where(Theta1 > 0, hbc*np.float_power((ThetaS/Theta1),(1/Lambda)), 0.0)
+        Kh = np.where(Theta1 < ThetaS, Ks*np.float_power((Theta1/ThetaS),Eta), 0.0)
+        
+        # Flux from unsaturated zone (qh)
+        qmax = Rd - RET + Theta2prev*SoilThick
+        qhbis = -Kh*(hUnsat/SoilThick-1)
+        qh = np.where(Kh > 0, np.where(qhbis < qmax, qhbis, np.where(qmax > 0, qmax, 0.0)), 0.0)
+        
+        # Saturated thickness (hs)
+        hs = np.where(Theta1 == ThetaS, Rd - RET - (ThetaS - Theta2prev) * SoilThick + SoilThick, 0.0)
+        
+        # Flux from saturated zone (qs)
+        qsbis = hs/SoilThick*Ks
+        qs = np.where((qh == 0) & (Theta1 == ThetaS) & (hs >= 0), np.where(qsbis <= qmax, qsbis, np.where(qsbis > qmax, qmax, 0.0)), 0.0)
+        
+        # Total outflow  (qout)
+        qout = qs + qh
+        
+        # Saturated media budget (DeltaS)
+        DeltaS = np.where((qh == 0) & (qs >= 0), Rd - RET - (ThetaS - Theta2prev)*SoilThick - qout, 0.0)
+        
+        # Soil moisture at end of timestep (Theta2)
+        Theta2_1 = np.where((qh >= 0) & (Theta1 < ThetaS), Theta1 - qh/SoilThick, 0.0) # If media is unsaturated
+        Theta2_2bis = Theta1 + (Rd - RET - (ThetaS - Theta2prev)*SoilThick - qout)/SoilThick
+        Sat = (Theta2_1 == 0) & (qs >= 0) & (Theta1 == ThetaS) # If media is saturated
+        Theta2_2 = np.where(Sat & (Theta2_2bis > 0) & (DeltaS < 0), Theta2_2bis, 1E-10)
+        Theta2_2 = np.where(Sat & (DeltaS >= 0), Theta2_2 + (ThetaS - 1E-10), Theta2_2)
+        Theta2 = np.where((Theta2_1 >= 0) & (Theta2_2 >= 0), Theta2_1 + Theta2_2, 0.0)
+        
+        # Soil moisture deficit
+        Deficit = np.where((Theta1 == 1E-10) & (Theta1bis < 0), -(Theta2prev*SoilThick + Rd- RET), 0.0)
+        
+        # Actual evapotranspiration
+        AET = RET - Deficit
+    
+    return(Rd,Runoff,Theta1,hUnsat,Kh,qh,Theta2,hs,qs,qout,DeltaS,Deficit,AET)
+
+def HydMod_forcing(X,NumDays,NumCat):
+    
+    """Broadcasts a forcing series (days) or table (days x categories) to a float array of shape (days x categories)
+    """
+    
+    if X is None:
+        return(np.zeros((NumDays,NumCat)))
+    X = np.asarray(X,dtype=float)
+    if X.ndim == 1:
+        X = X[:,np.newaxis]
+    return(np.broadcast_to(X,(NumDays,NumCat)))
+
+def HydMod_cat_fun(Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,R,PG,RET,Outputs=HydModColumns,Totals=None,Dates=None,State=None,Snapshots=None):
+    
+    """Hydraulic model run for all soil and land use combinations (categories) in lockstep
+    
+    Inputs: hydraulic parameters as vectors (one value per category, scalars are broadcast), 
+    R, PG and RET as (days x categories) tables or single daily series shared by all categories (m), PG may be None,
+    names of the HydModColumns to return (all by default), optional totals and dates, 
+    initial state (2 x categories) and snapshot dictionary (see HydMod_column_fun)
+    
+    Outputs: dictionary of (days x categories) arrays holding only the requested columns;
+    if Totals is given, also a dictionary {frequency: {column: (periods x categories) DataFrame}}
+    
+    Remarks: state that is not requested is kept for the current day only and never stored over the whole period;
+    single-horizon case of HydMod_column_fun
+    """
+    
+    RET = np.asarray(RET,dtype=float)
+    NumCat = max([np.size(p) for p in (Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta)] + [RET.shape[1] if RET.ndim > 1 else 1])
+    Params = np.transpose([np.broadcast_to(np.asarray(p,dtype=float),(NumCat,)) for p in (Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta)])
+    
+    if State is not None:
+        State = State[:,np.newaxis,:] # Single horizon view, filled in place
+    
+    if Totals is None:
+        return(HydMod_column_fun([Params],R,PG,RET,Outputs=Outputs,Dates=Dates,State=State,Snapshots=Snapshots)[0])
+    
+    Out, Tot = HydMod_column_fun([Params],R,PG,RET,Outputs=Outputs,Totals=Totals,Dates=Dates,State=State,Snapshots=Snapshots)
+    
+    return(Out[0],Tot[0])
+
+def HydMod_batch_fun(ParamSets,InputData,Output='qout'):
+    
+    """Hydraulic model run for many parameter sets on the same forcing
+    
+    Inputs: parameter matrix (sets x 7, columns ordered as HydModParams), 
+    Dataframe containing Rainfall (R), Real Evapotranspiration (RET) and optionally Pumping (PG) at a daily time-step (as in HydMod_fun),
+    name of the HydModColumns to return
+    
+    Outputs: (sets x days) array of the requested column
+    
+    Remarks: all parameter sets are run in a single pass, each set is treated as a category of HydMod_cat_fun
+    """
+    
+    Params = HydMod_params(ParamSets)
+    PG = InputData['PG'] if 'PG' in InputData.columns else 0.0
+    
+    Out = HydMod_cat_fun(*Params,R=InputData['R'],PG=PG,RET=InputData['RET'],Outputs=[Output])
+    
+    return(Out[Output].T)
+    
+########## SOIL COLUMN HYDRAULIC MODEL (N HORIZONS) ##########
+
+HydModParams = ['Ks','SoilThick','ThetaS','Thresh','Lambda','hbc','Eta'] # Order of columns in parameter tables
+
+def HydMod_params(Params):
+    
+    """Converts a (categories x 7) parameter table with columns ordered as HydModParams into a list of 7 float vectors
+    """
+    
+    if isinstance(Params,pd.DataFrame):
+        Params = Params[HydModParams]
+    Params = np.asarray(Params,dtype=float).reshape(-1,len(HydModParams))
+    return([np.array(p) for p in Params.T])
+
+def HydMod_column_params(Params):
+    
+    """Converts a stack of parameter tables (horizons x categories x 7), or a list of one table per horizon,
+    into a float array of shape (horizons x 7 x categories)
+    """
+    
+    if isinstance(Params,pd.DataFrame):
+        Params = [Params]
+    return(np.array([HydMod_params(p) for p in Params]))
+
+if numba is not None:
+    
+    @numba.njit(parallel=True, cache=True, error_model='numpy')
+    def HydMod_column_kernel_jit(P,R,PG,RET,Target,Out,TotTarget,Codes,Tot,State,Start,SnapDays,Snap):
+        
+        """Compiled soil column run in parallel over categories, each horizon is fed by qout and Deficit of the one above
+        
+        Inputs: (horizons x 7 x categories) parameter array, R, PG and RET of the top horizon as (categories x days) arrays, 
+        Target (horizons x 13) giving for each row of HydModColumns its slot in Out or -1 if not stored,
+        preallocated Out (categories x slots x days), TotTarget (horizons x 13 x frequencies) giving the slot in Tot or -1,
+        period numbers Codes (frequencies x days), preallocated Tot (categories x slots x periods),
+        State (2 x horizons x categories) before day Start, overwritten with the final state,
+        snapshot days SnapDays and preallocated Snap (snapshots x 2 x horizons x categories)
+        """
+        
+        NumDays = R.shape[1]
+        for c in numba.prange(R.shape[0]):
+            Zeros = np.zeros(NumDays)
+            Rc = R[c]
+            PGc = PG[c]
+            RETc = RET[c]
+            for h in range(P.shape[0]):
+                Full = np.zeros((13,NumDays)) # Single category buffer, only Target rows are kept
+                St = np.array([State[0,h,c],State[1,h,c]])
+                Sn = np.zeros((len(SnapDays),2))
+                HydMod_kernel_jit(P[h,0,c],P[h,1,c],P[h,2,c],P[h,3,c],P[h,4,c],P[h,5,c],P[h,6,c],Rc,PGc,RETc,Full,St,Start,SnapDays,Sn)
+                State[0,h,c] = St[0]
+                State[1,h,c] = St[1]
+                for s in range(len(SnapDays)):
+                    Snap[s,0,h,c] = Sn[s,0]
+                    Snap[s,1,h,c] = Sn[s,1]
+                for k in range(13):
+                    if Target[h,k] >= 0:
+                        Out[c,Target[h,k]] = Full[k]
+                    for f in range(Codes.shape[0]):
+                        if TotTarget[h,k,f] >= 0:
+                            for d in range(NumDays):
+                                Tot[c,TotTarget[h,k,f],Codes[f,d]] += Full[k,d]
+                Rc = Full[9]
+                PGc = Zeros
+                RETc = Full[11]
+        
+        return(Out)
+
+def HydMod_column_fun(Params,R,PG,RET,Outputs=['qout','Deficit','AET'],Totals=None,Dates=None,State=None,Snapshots=None):
+    
+    """Hydraulic model for a soil column of any number of horizons, for all categories in lockstep
+    
+    Inputs: parameter stack (horizons x categories x 7, columns ordered as HydModParams) or list of one table per horizon
+    (top horizon first), R, PG and RET of the top horizon as (days x categories) tables or single daily series (m),
+    names of the HydModColumns to return, either one list for all horizons or one list per horizon,
+    optional totals to accumulate as a dictionary {frequency: columns} with frequencies 'A', 'M' or 'S' (see Calendar_def),
+    the daily dates of the run, optional initial State as a (2 x horizons x categories) float array [Theta2, DeltaS]
+    and optional dictionary Snapshots filled with the state at each year boundary
+    
+    Outputs: list with one dictionary of (days x categories) arrays per horizon, holding only the requested columns;
+    if Totals is given, also a list with one dictionary {frequency: {column: (periods x categories) DataFrame}} per horizon
+    
+    Remarks: within each day, outflow (qout) and deficit of a horizon are the inflow and evaporation demand 
+    of the horizon below (no pumping); use a large Thresh for lower horizons to prevent runoff.
+    Totals are summed while the model runs, use Outputs=[] to keep only the totals.
+    Without State the run starts dry and the first day is not simulated (as in HydMod_fun); with State every day
+    is simulated from that state, which is then overwritten with the state at the end of the run.
+    Snapshots are keyed by the first date of each year and hold the state before that day, so a run can be resumed
+    from any year with the forcing from that date onwards (see HydMod_state_last)
+    """
+    
+    P = HydMod_column_params(Params)
+    NumHor, NumCat = P.shape[0], P.shape[2]
+    if (len(Outputs) == 0) or isinstance(Outputs[0],str):
+        Outputs = [Outputs]*NumHor
+    
+    RET = np.asarray(RET,dtype=float)
+    NumDays = RET.shape[0]
+    R = HydMod_forcing(R,NumDays,NumCat)
+    PG = HydMod_forcing(PG,NumDays,NumCat)
+    RET = HydMod_forcing(RET,NumDays,NumCat)
+    
+    ## Aggregation periods
+    Freqs = sorted(Totals.keys()) if Totals is not None else []
+    Codes, Labels = Periods_fun(Dates,Freqs) if Totals is not None else (np.zeros((0,NumDays),dtype=np.int64),[])
+    NumPer = [len(l) for l in Labels]
+    
+    ## Initial state and year boundaries at which it is saved
+    Start = 1 if State is None else 0
+    if State is None:
+        State = np.zeros((2,NumHor,NumCat))
+    SnapDays = np.zeros(0,dtype=np.int64)
+    if Snapshots is not None:
+        Years = np.asarray(pd.DatetimeIndex(pd.to_datetime(Dates)).year)
+        SnapDays = np.flatnonzero(np.diff(Years) != 0).astype(np.int64) + 1
+        SnapDays = SnapDays[SnapDays >= Start]
+    Snap = np.zeros((len(SnapDays),2,NumHor,NumCat))
+    
+    if HydModBackend == 'numba':
+        Target = -np.ones((NumHor,len(HydModColumns)),dtype=np.int64)
+        Slots = [] # (horizon, column) stored in each slot of the compiled output
+        for h in range(NumHor):
+            for col in Outputs[h]:
+                Target[h,HydModColumns.index(col)] = len(Slots)
+                Slots.append((h,col))
+        TotTarget = -np.ones((NumHor,len(HydModColumns),len(Freqs)),dtype=np.int64)
+        TotSlots = [] # (horizon, frequency, column) accumulated in each slot of the compiled totals
+        for h in range(NumHor):
+            for f, Freq in enumerate(Freqs):
+                for col in Totals[Freq]:
+                    TotTarget[h,HydModColumns.index(col),f] = len(TotSlots)
+                    TotSlots.append((h,Freq,col))
+        Out3 = np.zeros((NumCat,len(Slots),NumDays))
+        Tot3 = np.zeros((NumCat,len(TotSlots),max(NumPer + [1])))
+        State3 = np.array(State,dtype=float)
+        HydMod_column_kernel_jit(P,np.ascontiguousarray(R.T),np.ascontiguousarray(PG.T),np.ascontiguousarray(RET.T),Target,Out3,TotTarget,Codes,Tot3,
+                                 State3,Start,SnapDays,Snap)
+        State[...] = State3
+        Out = [{} for h in range(NumHor)]
+        for k, (h,col) in enumerate(Slots):
+            Out[h][col] = np.ascontiguousarray(Out3[:,k,:].T)
+        Acc = [dict((Freq,{}) for Freq in Freqs) for h in range(NumHor)]
+        for k, (h,Freq,col) in enumerate(TotSlots):
+            Acc[h][Freq][col] = np.ascontiguousarray(Tot3[:,k,:NumPer[Freqs.index(Freq)]].T)
+    
+    else:
+        Out = [dict((col,np.zeros((NumDays,NumCat))) for col in Outputs[h]) for h in range(NumHor)]
+        Rows = [[(HydModColumns.index(col),col) for col in Outputs[h]] for h in range(NumHor)]
+        Acc = [dict((Freq,dict((col,np.zeros((NumPer[f],NumCat))) for col in Totals[Freq])) for f, Freq in enumerate(Freqs)) for h in range(NumHor)]
+        TotRows = [(f,Freq,HydModColumns.index(col),col) for f, Freq in enumerate(Freqs) for col in Totals[Freq]]
+        Theta2 = np.array(State[0],dtype=float) # State of each horizon
+        DeltaS = np.array(State[1],dtype=float)
+        s = 0
+        
+        for i in range(Start,NumDays):
+            
+            if (s < len(SnapDays)) and (SnapDays[s] == i): # Snapshot of the state before day i
+                Snap[s] = Theta2, DeltaS
+                s += 1
+            
+            Rh, PGh, RETh = R[i], PG[i], RET[i]
+            
+            for h in range(NumHor):
+                
+                Step = HydMod_step(Theta2[h],DeltaS[h],*P[h],R=Rh,PG=PGh,RET=RETh)
+                for j, col in Rows[h]:
+                    Out[h][col][i] = Step[j]
+                for f, Freq, j, col in TotRows: # Running totals
+                    Acc[h][Freq][col][Codes[f,i]] += Step[j]
+                
+                Theta2[h], DeltaS[h] = Step[6], Step[10]
+                Rh, PGh, RETh = Step[9], 0.0, Step[11] # qout and Deficit feed the horizon below
+        
+        State[0], State[1] = Theta2, DeltaS
+    
+    if Snapshots is not None:
+        for s, d in enumerate(SnapDays):
+            Snapshots[pd.Timestamp(pd.to_datetime(Dates)[d])] = Snap[s]
+    
+    if Totals is None:
+        return(Out)
+    
+    Tot = [dict((Freq,dict((col,pd.DataFrame(Acc[h][Freq][col],index=Labels[f])) for col in Totals[Freq])) for f, Freq in enumerate(Freqs)) for h in range(NumHor)]
+    
+    return(Out,Tot)
+
+def HydMod_2lay_fun(Params1,Params2,R,PG,RET,Outputs1=['qout','Runoff','Deficit','AET'],Outputs2=['qout','Deficit','AET'],Totals=None,Dates=None,State=None,Snapshots=None):
+    
+    """Hydraulic model for both soil horizons (hE and hB) in a single daily loop, for all categories in lockstep
+    
+    Inputs: parameter tables for layer 1 and layer 2 (categories x 7, columns ordered as HydModParams), 
+    R, PG and RET for layer 1 as (days x categories) tables or single daily series (m), 
+    names of the HydModColumns to return for each layer, optional totals and dates, 
+    initial state (2 x 2 x categories) and snapshot dictionary (see HydMod_column_fun)
+    
+    Outputs: two dictionaries of (days x categories) arrays, one per layer, holding only the requested columns;
+    if Totals is given, followed by the totals of each layer
+    
+    Remarks: two-horizon case of HydMod_column_fun
+    """
+    
+    if Totals is None:
+        Out1, Out2 = HydMod_column_fun([Params1,Params2],R,PG,RET,Outputs=[Outputs1,Outputs2],Dates=Dates,State=State,Snapshots=Snapshots)
+        return(Out1,Out2)
+    
+    (Out1, Out2), (Tot1, Tot2) = HydMod_column_fun([Params1,Params2],R,PG,RET,Outputs=[Outputs1,Outputs2],Totals=Totals,Dates=Dates,
+                                                   State=State,Snapshots=Snapshots)
+    
+    return(Out1,Out2,Tot1,Tot2)
+    
+### APPLICATION EXAMPLE
+#
+### Inputs
+#import HydModel_FineGrid_inputs_THESE as HydModel_inputs
+#
+#InputClimate = HydModel_inputs.InputClimate
+#InputPG = HydModel_inputs.InputPG 
+#InputPG_Yrly = InputPG.resample("A").sum()
+#InputPG_Yrly.index = InputPG_Yrly.index.year
+#InputRET = HydModel_inputs.InputRET
+#InputCf = HydModel_inputs.InputCf 
+#    
+### hE
+#Thresh = 0.03
+#Ks = np.multiply(1.21E-05,86400) # Saturated Hydraulic conductivity (m/s)
+#ThetaS = 0.35 # Saturated soil moisture content (m3/m3)
+#Lambda = 0.129 # Pore-size-distribution parameter
+#hbc = -0.06 # Air-entry pressure head (m)
+#Eta = 19.3 # Texture-dependent conductivity shape parameter
+#SoilThick = 0.4 # Soil thickness(m)
+#
+#HydMod_fun(Ks,SoilThick,ThetaS,Thresh,Lambda,hbc,Eta,InputData)
+#
+### hB
+#Ks2 = np.multiply(1.08E-5,86400)
+#ThetaS2 =  0.35
+#Lambda2 = 0.096
+#hbc2 = -0.123
+#Eta2 = 24.1
+#SoilThick2 = 1.13 # Soil thickness (hB) (m)
+
+########## MODEL STATE ##########
+
+def HydMod_state_save(Snapshots,FileName):
+    
+    """Saves state snapshots {date: (2 x horizons x categories) array} to a compressed .npz file
+    """
+    
+    np.savez_compressed(FileName,**dict((pd.Timestamp(d).strftime('%Y-%m-%d'),s) for d, s in Snapshots.items()))
+
+def HydMod_state_load(FileName):
+    
+    """Loads state snapshots saved with HydMod_state_save
+    
+    Outputs: dictionary {date: (2 x horizons x categories) array}
+    """
+    
+    Data = np.load(FileName)
+    
+    return(dict((pd.Timestamp(d),Data[d]) for d in Data.files))
+
+def HydMod_state_last(Snapshots,Date):
+    
+    """Latest snapshot taken on or before Date
+    
+    Outputs: date of the snapshot and a copy of its state, to be passed as State with the forcing from that date onwards
+    """
+    
+    Dates = [d for d in sorted(Snapshots.keys()) if d <= pd.Timestamp(Date)]
+    if len(Dates) == 0:
+        raise ValueError("No snapshot on or before %s" % pd.Timestamp(Date).date())
+    
+    return(Dates[-1],np.array(Snapshots[Dates[-1]]))
+
+########## SPIN-UP ##########
+
+HydModSpinupCache = {} # Periodic states already solved, keyed by a hash of the parameters and forcing of each category
+
+def HydMod_spinup_fun(Params,R,PG,RET,Tol=1E-6,MaxIter=60,Cache=HydModSpinupCache):
+    
+    """Periodic steady state of a soil column: initial state that is found again after running a reference year
+    
+    Inputs: parameter stack or list of tables (see HydMod_column_fun), R, PG and RET of the reference year 
+    as (days x categories) tables or single daily series (m), tolerance on Theta2 (m3/m3) and DeltaS (m),
+    maximum number of runs of the year, dictionary of cached states (None for no cache)
+    
+    Outputs: (2 x horizons x categories) state [Theta2, DeltaS] to pass as State to HydMod_column_fun, 
+    for a run starting on the same calendar day as the reference year
+    
+    Remarks: fixed-point iteration accelerated by Aitken extrapolation every third run, only categories that have not
+    converged are run again. Most categories end the dry season in the deficit-only state and converge in two runs
+    """
+    
+    P = HydMod_column_params(Params)
+    NumHor, NumCat = P.shape[0], P.shape[2]
+    RET = np.asarray(RET,dtype=float)
+    NumDays = RET.shape[0]
+    R = np.array(HydMod_forcing(R,NumDays,NumCat))
+    PG = np.array(HydMod_forcing(PG,NumDays,NumCat))
+    RET = np.array(HydMod_forcing(RET,NumDays,NumCat))
+    
+    ## Cached categories
+    Keys = [hashlib.sha1(P[:,:,c].tobytes() + R[:,c].tobytes() + PG[:,c].tobytes() + RET[:,c].tobytes() + np.float64(Tol).tobytes()).hexdigest()
+            for c in range(NumCat)]
+    State = np.zeros((2,NumHor,NumCat))
+    Active = np.ones(NumCat,dtype=bool)
+    if Cache is not None:
+        for c in range(NumCat):
+            if Keys[c] in Cache:
+                State[:,:,c] = Cache[Keys[c]]
+                Active[c] = False
+    
+    ## Fixed-point iteration
+    X = [State.copy()] # Last iterates since the previous extrapolation
+    for it in range(MaxIter):
+        
+        if not Active.any():
+            break
+        
+        Y = X[-1].copy()
+        Cat = np.flatnonzero(Active)
+        YCat = Y[:,:,Cat]
+        HydMod_column_fun(P[:,:,Cat].transpose(0,2,1),R[:,Cat],PG[:,Cat],RET[:,Cat],Outputs=[],State=YCat)
+        Y[:,:,Cat] = YCat
+        
+        Conv = np.zeros(NumCat,dtype=bool)
+        Conv[Cat] = (np.abs(YCat - X[-1][:,:,Cat]) <= Tol).all(axis=(0,1))
+        State[:,:,Conv] = Y[:,:,Conv]
+        Active &= ~Conv
+        X.append(Y)
+        
+        if len(X) == 3: # Aitken extrapolation from the last three iterates, where it is defined
+            with np.errstate(divide='ignore', invalid='ignore'):
+                Den = X[2] - 2*X[1] + X[0]
+                Acc = X[2] - (X[2] - X[1])**2/Den
+            Acc = np.where(np.isfinite(Acc) & (Den != 0), Acc, X[2])
+            Acc[0] = np.clip(Acc[0],0,P[:,2]) # Theta2 between 0 and ThetaS
+            X = [Acc]
+    
+    if Active.any():
+        warnings.warn('HydMod spin-up did not converge for %d categories after %d years' % (Active.sum(),MaxIter),RuntimeWarning)
+        State[:,:,Active] = X[-1][:,:,Active]
+    
+    if Cache is not None:
+        for c in np.flatnonzero(~Active):
+            Cache[Keys[c]] = State[:,:,c].copy()
+    
+    return(State)
+
+########## INPUT DATA ##########
+
+AlphaIndex = list(itertools.chain(string.ascii_uppercase,(''.join(pair) for pair in itertools.product(string.ascii_uppercase, repeat=2))))
+
+def HydMod_index_save(Index):
+    
+    """Index as an array that np.load reads without pickling
+    """
+    
+    Index = np.asarray(Index)
+    
+    return(Index.astype(str) if Index.dtype == object else Index)
+
+def HydMod_inputs_fun(ClimateFile,CategoriesFile,Kp=0.9,CacheDir=None):
+    
+    """Inputs of the fine grid HydMod, built without changing the working directory or any global
+    
+    Inputs: climate file (daily Rainfall_mm and PET_mm in mm), categories file (SoilClass and LandUse per grid cell),
+    regional evaporation coefficient Kp, folder of the cache file (None for no cache)
+    
+    Outputs: dictionary with InputClimate (dates as index), InputCategories, InputCategoriesUnique 
+    (each SoilClass and LandUse combination once, indexed by letters) and float tables InputKc, InputPG (m), InputCf 
+    and InputRET (m) (days x categories)
+    
+    Remarks: the cache file is named after a hash of both input files, Kp and the crop calendar, 
+    so any change builds the inputs again; a warm start only loads the npz file
+    """
+    
+    Key = hashlib.sha1()
+    for FileName in (ClimateFile,CategoriesFile):
+        with open(FileName,'rb') as f:
+            Key.update(f.read())
+    Key.update(repr(float(Kp)).encode())
+    Key.update(repr(sorted((v, sorted(CropCalendar[v].items())) for v in CropCalendar)).encode())
+    CacheFile = None if CacheDir is None else os.path.join(CacheDir,'HydModInputs_' + Key.hexdigest()[:16] + '.npz')
+    
+    Tables = None
+    if (CacheFile is not None) and os.path.exists(CacheFile):
+        
+        with np.load(CacheFile) as Data: # Everything is read before the file is closed
+            Dates = pd.DatetimeIndex(Data['Dates'],name=str(Data['DatesName']) or None)
+            InputClimate = pd.DataFrame(Data['Climate'],index=Dates,columns=Data['ClimateColumns'])
+            InputCategories = pd.DataFrame(dict((c,Data['Cells_' + c]) for c in Data['CellsColumns']),columns=Data['CellsColumns'],
+                                           index=pd.Index(Data['Cells'],name=str(Data['CellsName']) or None))
+            Tables = dict((k,Data[k]) for k in ['InputKc','InputPG','InputCf','InputRET'])
+    
+    else:
+        
+        ## INPUT DATA
+        InputClimate = pd.read_csv(ClimateFile,sep='\t',header=0,index_col=0) # Potential evaporation & rainfall (in mm)
+        InputClimate.index = pd.to_datetime(InputClimate.index)
+        InputCategories = pd.read_csv(CategoriesFile,sep='\t',header=0,index_col=0) # SoilClass and LU for each grid cell
+    
+    InputCategoriesUnique = InputCategories.drop_duplicates() # SoilClass and LU combinations are considered once each
+    InputCategoriesUnique.index = AlphaIndex[0:len(InputCategoriesUnique)] # Sets indexes as letters
+    Dates = InputClimate.index
+    Cats = InputCategoriesUnique.index
+    Inputs = {'InputClimate': InputClimate, 'InputCategories': InputCategories, 'InputCategoriesUnique': InputCategoriesUnique}
+    
+    if Tables is not None:
+        for k in ['InputKc','InputPG','InputCf','InputRET']:
+            Inputs[k] = pd.DataFrame(Tables[k],index=Dates,columns=Cats)
+        return(Inputs)
+    
+    ## CROP COEFFICIENT, EVAPORATION (m), PUMPING (m) AND PERCENTAGE OF RECHARGE EQUAL TO RETURN FLOW
+    LandUses = InputCategoriesUnique['LandUse'] # Land use of each category
+    Inputs['InputKc'] = Crop_daily_fun(Crop_compile_fun(CropCalendar['Kc']),Dates,LandUses,Cats)
+    Inputs['InputRET'] = Inputs['InputKc'].multiply(InputClimate['PET_mm'],axis="index")*Kp/1000
+    Inputs['InputPG'] = Crop_daily_fun(Crop_compile_fun(CropCalendar['PG']),Dates,LandUses,Cats)/1000
+    Inputs['InputCf'] = Crop_daily_fun(Crop_compile_fun(CropCalendar['Cf']),Dates,LandUses,Cats)
+    
+    if CacheFile is not None: # Written to a temporary file then moved into place, so a crash never leaves a truncated cache
+        Fd, TmpFile = tempfile.mkstemp(suffix='.npz',dir=os.path.dirname(CacheFile))
+        try:
+            with os.fdopen(Fd,'wb') as f:
+                np.savez(f, Dates=np.asarray(Dates.values), DatesName=str(Dates.name or ''),
+                         Climate=np.asarray(InputClimate,dtype=float), ClimateColumns=HydMod_index_save(InputClimate.columns),
+                         Cells=HydMod_index_save(InputCategories.index), CellsName=str(InputCategories.index.name or ''),
+                         CellsColumns=HydMod_index_save(InputCategories.columns),
+                         **dict([('Cells_' + str(c),HydMod_index_save(InputCategories[c])) for c in InputCategories.columns] + 
+                                [(k,np.asarray(Inputs[k],dtype=float)) for k in ['InputKc','InputPG','InputCf','InputRET']]))
+            if os.path.exists(CacheFile): # os.rename does not overwrite on Windows
+                os.remove(CacheFile)
+            os.rename(TmpFile,CacheFile)
+        except BaseException:
+            if os.path.exists(TmpFile):
+                os.remove(TmpFile)
+            raise
+    
+    return(Inputs)
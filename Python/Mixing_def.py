@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Author: Madeleine NICOLAS
+        madeleine.nicolas@univ-rennes1.fr
+
+Purpose: Weighting of soil type or land use results by their percentage in each grid cell (shared by HydMod and SMBM)
+
+Requirements: Percentage table per grid cell, such as INPUT_soil-type.txt or INPUT_landuse-type.txt
+
+Remarks: percentage columns are named after the type followed by 'Per' (e.g. 'Alfi1Per');
+         the weights are built once and applied to any daily or yearly table as a single matrix product
+
+Date:   October 2026
+"""
+
+import numpy as np
+import pandas as pd
+
+try: # Optional sparse weights for fine grids
+    import scipy.sparse
+except ImportError:
+    scipy = None
+
+def Mix_weights_fun(PctTable,Types=None,Sparse=None):
+
+    """Weight matrix of grid cells over types
+
+    Inputs: percentage table (grid cells x '<type>Per' columns), types to keep (default: all 'Per' columns, in table order),
+    Sparse: True for a scipy.sparse matrix, False for a dense array, None to choose from the number of cells and non-zero weights
+
+    Outputs: dictionary with W (cells x types weights, percentages/100), Cells and Types
+    """
+
+    if Types is None:
+        Types = [c[:-3] for c in PctTable.columns if c.endswith('Per')]
+    Types = list(Types)
+    W = np.asarray(PctTable[[t + 'Per' for t in Types]],dtype=float)/100
+
+    if Sparse is None: # Sparse only pays off on large grids with few types per cell
+        Sparse = (scipy is not None) and (W.shape[0] > 1000) and (np.count_nonzero(W) < 0.25*W.size)
+    if Sparse:
+        if scipy is None:
+            raise ImportError("scipy is required for sparse weights")
+        W = scipy.sparse.csr_matrix(W)
+
+    return({'W': W, 'Cells': PctTable.index, 'Types': Types})
+
+def Mix_fun(Mix,X):
+
+    """Weighted sum of type-level values for each grid cell
+
+    Inputs: weights from Mix_weights_fun, (periods x types) DataFrame with the types as columns (other columns are ignored)
+    or array with the types in the order of Mix['Types']
+
+    Outputs: (periods x cells) DataFrame with the index of X, or array
+    """
+
+    A = np.asarray(X[Mix['Types']] if isinstance(X,pd.DataFrame) else X,dtype=float)
+    Out = np.asarray(Mix['W'].dot(A.T)).T
+
+    if isinstance(X,pd.DataFrame):
+        return(pd.DataFrame(Out,index=X.index,columns=Mix['Cells']))
+
+    return(Out)
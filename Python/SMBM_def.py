@@ -1,196 +1,923 @@
-# -*- coding: utf-8 -*-
-"""
-Author: Madeleine NICOLAS       
-        madeleine.nicolas@univ-rennes1.fr
-
-Purpose: Soil moisture model used in SMBM_Mahesh
-
-Output: Recharge for one specific set of soil properties
-
-Requirements: 
-
-Remarks: 
-
-Date:   January 2018
-"""
-import pandas as pd
-import os 
-import numpy as np
-
-os.chdir(r"C:\Users\Madeleine\Desktop\Soil moisture model\03 - PYTHON CODES")
-
-################################
-#####    SINGLE FUNCTION   #####
-################################
-
-def SMBM_fun(IWC,MWC,AWC):
-    
-    """Model which calculates Soil Moisture Balance for a single soil type
-    Inputs: Initial Water Content (IWC), Maximum surface storage (MWC) and Available Water Content (AWC)
-    """
-     
-    # REFERENCE RECHARGE
-    InputRechYearly = pd.read_csv("INPUT_ref-rech_2002-2015.txt",sep='\t',header=0,index_col=0) 
-    InputRechMean = InputRechYearly.mean(axis=0)
-    InputRechMean.index = pd.to_datetime(InputRechMean.index).year
-    
-    ## INPUT CLIMATE DATA
-    InputClimate = pd.read_csv("INPUT_climate_2002-2015.txt",sep='\t',header=0,index_col=0)
-    InputClimate.index=pd.to_datetime(InputClimate.index)
-
-    # Initialize dataframe
-    SMBMTab = pd.DataFrame(index=InputClimate.index, columns=[["DeltaR","AW","D/E","RET","Rech"]]) 
-   
-    ## Stock Variations
-    SMBMTab["DeltaR"][InputClimate["Rainfall_mm"]>=MWC] = MWC - InputClimate["PET_mm"]
-    SMBMTab["DeltaR"][InputClimate["Rainfall_mm"]<MWC] = InputClimate["Rainfall_mm"] - InputClimate["PET_mm"]
-        
-    for d in range(0,len(InputClimate)):
-        
-        ## Initialize data frame
-        if d==0:  
-            prev = IWC
-        else:
-            prev = SMBMTab["AW"][d-1]
-            
-        ## Available Water
-        if prev + SMBMTab["DeltaR"][d] > AWC:
-            SMBMTab["AW"][d] = AWC
-        elif prev + SMBMTab["DeltaR"][d] < 0:
-            SMBMTab["AW"][d] = 0
-        else:
-            SMBMTab["AW"][d] = prev + SMBMTab["DeltaR"][d]
-        
-        ## Excess or deficit
-        SMBMTab["D/E"][d] = SMBMTab["DeltaR"][d] + prev - SMBMTab["AW"][d]
-        
-        # Real evaporation and Recharge
-        if SMBMTab["D/E"][d] > 0:
-            SMBMTab["RET"][d] = InputClimate["PET_mm"][d]
-            SMBMTab["Rech"][d] = SMBMTab["D/E"][d]
-        else:
-            SMBMTab["RET"][d] = InputClimate["PET_mm"][d] + SMBMTab["D/E"][d]
-            SMBMTab["Rech"][d] = 0
-    
-    SMBMTabYearly = SMBMTab["Rech"].resample("A").sum()
-        
-    SMBMTabYearly.index = SMBMTabYearly.index.year
-    Err=np.sqrt(((InputRechYearly - SMBMTabYearly) ** 2).mean())
-    
-    return SMBMTab, Err
-
-####################################
-#####    AGGREGATED FUNCTION   #####
-####################################
-
-def SMBMSoilType_fun(InputSoilAWC,InputSoilMWC,IWC, InputSoilType, SMBMSoilType, InputRechYearly):
-
-    """Model run which aggregates Soil Moisture Balance for different soil types
-    Inputs: array of AWCs and MWCs (must be same length), Initial Water Content (IWC), 
-    Soil Type percentages per grid cell (InputSoilType), initialized table with correct colnames (SMBMSoilType),
-    Reference recharge at each grid cell per year (InputRechYearly)
-    """
-
-    ## Obtain recharge for each soil type
-    for c in SMBMSoilType.columns:
-        AWC = InputSoilAWC['SoilAWC'][c]
-        MWC = InputSoilMWC['SoilMWC'][c]
-        SMBMSoilType[c] = SMBM_fun(IWC,MWC,AWC)[0]['Rech']
-        print(c)
-
-    ## Obtain for each grid cell using soil type percentages
-    SMBMDiscr = pd.DataFrame(0,index=SMBMSoilType.index, columns=InputSoilType.index) # Initialize dataframe
-    for gr in InputSoilType.index: # Discretized model
-        for st in SMBMSoilType.columns:
-           SMBMDiscr[gr] += SMBMSoilType[st]*InputSoilType[st+'Per'][gr]/100
-
-    SMBMDiscrYearly = SMBMDiscr.resample("A").sum().transpose() # Yearly average
-    SMBMDiscrYearly.columns = SMBMDiscrYearly.columns.year
-
-    ## Error calculation
-    ErrTab = pd.DataFrame(0,index=InputRechYearly.index, columns=InputRechYearly.columns)
-
-    for y in InputRechYearly.columns:
-        ErrTab[str(y)] = (SMBMDiscrYearly[int(y)]-InputRechYearly[str(y)])
-
-    ErrTabAv = np.mean(ErrTab,axis=0)
-    ErrTabTot = np.sum(ErrTabAv,axis=0)
-
-    print('done')
-
-    return (SMBMDiscrYearly,ErrTab,ErrTabTot)
-
-#################################
-#####    CORRECT FUNCTION   #####
-#################################
-
-
-def SMBM_Cell_fun(gr, AWC, MWC, IWC, InputTotal, InputRET, InputCf, InputRechYearly):
-    
-    """Model which calculates Soil Moisture Balance for a single grid cell considering pumping and return flow
-    Inputs: Obtained from SMBM_Inputs
-    Outputs: SMBM for all period for grid cell, yearly values and error compared to obs
-    """
-
-    InputTotalCell = pd.DataFrame(InputTotal[gr]) # Rainfall and pumping
-    InputTotalCell.columns = ['Inputs_mm']
-    
-    InputRETCell = pd.DataFrame(InputRET[gr]) # Real evapotranspiration
-    InputRETCell.columns = ['RET_mm']
-    
-    # Initialize dataframe
-    SMBMTabCell = pd.DataFrame(index=InputTotalCell.index, columns=[["DeltaR","AW","D/E","RET","TotRech","NatRech","Runoff"]]) 
-   
-    ## Stock Variations
-    SMBMTabCell["DeltaR"][InputTotalCell["Inputs_mm"]>=MWC] = MWC - InputRETCell["RET_mm"]
-    SMBMTabCell["DeltaR"][InputTotalCell["Inputs_mm"]<MWC] = InputTotalCell["Inputs_mm"] - InputRETCell["RET_mm"]
-    
-    SMBMTabCell["Runoff"][InputTotalCell["Inputs_mm"]<=MWC] = 0
-    SMBMTabCell["Runoff"][InputTotalCell["Inputs_mm"]>MWC] = InputTotalCell["Inputs_mm"] - MWC
-        
-    for d in range(0,len(InputTotalCell)):
-        
-        ## Initialize data frame
-        if d==0:  
-            prev = IWC
-        else:
-            prev = SMBMTabCell["AW"][d-1]
-            
-        ## Available Water
-        if prev + SMBMTabCell["DeltaR"][d] > AWC:
-            SMBMTabCell["AW"][d] = AWC
-        elif prev + SMBMTabCell["DeltaR"][d] < 0:
-            SMBMTabCell["AW"][d] = 0
-        else:
-            SMBMTabCell["AW"][d] = prev + SMBMTabCell["DeltaR"][d]
-        
-        ## Excess or deficit
-        SMBMTabCell["D/E"][d] = SMBMTabCell["DeltaR"][d] + prev - SMBMTabCell["AW"][d]
-        
-        # Real evaporation and Recharge
-        if SMBMTabCell["D/E"][d] > 0:
-            SMBMTabCell["RET"][d] = InputRETCell["RET_mm"][d]
-            SMBMTabCell["TotRech"][d] = SMBMTabCell["D/E"][d]
-        else:
-            SMBMTabCell["RET"][d] = InputRETCell["RET_mm"][d] + SMBMTabCell["D/E"][d]
-            SMBMTabCell["TotRech"][d] = 0
-    
-    ## Partition natural recharge from recharge flow with RF Coef (Cf)
-    SMBMTabCell["NatRech"] = pd.DataFrame(InputCf[gr]).multiply(SMBMTabCell["TotRech"],axis="index")
-    
-    ## Yearly values
-    #Sim
-    SMBMRechCellYearly = pd.DataFrame(SMBMTabCell["NatRech"].resample("A").sum())
-    SMBMRechCellYearly.index = SMBMRechCellYearly.index.year
-    SMBMRechCellYearly.columns = ['RechCalc']
-    #Obs
-    RefRechCellYearly = pd.DataFrame(InputRechYearly[gr])
-    RefRechCellYearly.columns = ['RechObs']
-    
-    RechCellYearly = RefRechCellYearly.join(SMBMRechCellYearly)
-    
-    # Error calculation   
-    Err = np.sqrt(((RechCellYearly['RechCalc'][0:] - RechCellYearly['RechObs'][0:]) ** 2).mean())
-
-    return SMBMTabCell, Err, RechCellYearly
-    
\ No newline at end of file
+# -*- coding: utf-8 -*-
+"""
+Author: Madeleine NICOLAS       
+        madeleine.nicolas@univ-rennes1.fr
+
+Purpose: Soil moisture model used in SMBM_Mahesh
+
+Output: Recharge for one specific set of soil properties
+
+Requirements: 
+
+Remarks: 
+
+Date:   January 2018
+"""
+import pandas as pd
+import os 
+import numpy as np
+import multiprocessing
+import hashlib
+from collections import OrderedDict
+from Calendar_def import Period_fun, Periods_fun
+from Mixing_def import Mix_weights_fun, Mix_fun
+
+try: # Optional compiled backend
+    import numba
+except ImportError:
+    numba = None
+
+try: # Optimizer of the calibration drivers
+    from scipy.optimize import minimize
+except ImportError:
+    minimize = None
+
+os.chdir(r"C:\Users\Madeleine\Desktop\Soil moisture model\03 - PYTHON CODES")
+
+SMBMBackend = 'numba' if numba is not None else 'numpy' # Backend used for the daily bucket recursion
+
+def SMBM_set_backend(name):
+    
+    """Selects the backend of the bucket recursion: 'numba' (compiled, parallel over cells, default when installed), 'numpy' 
+    or 'scan' (associative scan over days, see SMBM_scan_kernel)
+    """
+    
+    global SMBMBackend
+    if name not in ('numba','numpy','scan'):
+        raise ValueError("Unknown backend '%s', use 'numba', 'numpy' or 'scan'" % name)
+    if (name == 'numba') & (numba is None):
+        raise ImportError("numba is not installed, only the 'numpy' and 'scan' backends are available")
+    SMBMBackend = name
+
+##############################
+#####    BUCKET KERNEL   #####
+##############################
+
+def SMBM_kernel(DeltaR,ET,AWC,IWC,AW,DE,RET,Rech):
+    
+    """Daily Soil Moisture Balance recursion for a single soil column on plain arrays
+    Inputs: stock variations (DeltaR) and evapotranspiration demand (ET) as 1D arrays (mm), AWC and IWC (mm),
+    preallocated arrays AW, DE (D/E), RET and Rech which are filled in place
+    """
+    
+    prev = IWC
+    
+    for d in range(len(DeltaR)):
+        
+        ## Available Water
+        if prev + DeltaR[d] > AWC:
+            AW[d] = AWC
+        elif prev + DeltaR[d] < 0:
+            AW[d] = 0
+        else:
+            AW[d] = prev + DeltaR[d]
+        
+        ## Excess or deficit
+        DE[d] = DeltaR[d] + prev - AW[d]
+        
+        # Real evaporation and Recharge
+        if DE[d] > 0:
+            RET[d] = ET[d]
+            Rech[d] = DE[d]
+        else:
+            RET[d] = ET[d] + DE[d]
+            Rech[d] = 0
+        
+        prev = AW[d]
+    
+    return(AW)
+
+def SMBM_cells_kernel(DeltaR,ET,AWC,IWC,AW,DE,RET,Rech):
+    
+    """Same recursion as SMBM_kernel advancing all cells in lockstep with masked arrays
+    Inputs: DeltaR and ET as (cells x days) arrays (mm), AWC and IWC vectors (cells), 
+    preallocated (cells x days) arrays AW, DE, RET and Rech which are filled in place
+    """
+    
+    prev = IWC
+    
+    for d in range(DeltaR.shape[1]):
+        AW[:,d] = np.where(prev + DeltaR[:,d] > AWC, AWC, np.where(prev + DeltaR[:,d] < 0, 0, prev + DeltaR[:,d]))
+        DE[:,d] = DeltaR[:,d] + prev - AW[:,d]
+        RET[:,d] = np.where(DE[:,d] > 0, ET[:,d], ET[:,d] + DE[:,d])
+        Rech[:,d] = np.where(DE[:,d] > 0, DE[:,d], 0)
+        prev = AW[:,d]
+    
+    return(AW)
+
+def SMBM_scan_compose(S,A,B,i,j):
+    
+    """Replaces the clamped shifts at rows j of S, A and B (shift, lower and upper bound) by their composition
+    with the maps at rows i, applied first: min(max(min(max(x + S[i],A[i]),B[i]) + S[j],A[j]),B[j])
+    """
+    
+    Sj, Aj, Bj = S[j], A[j], B[j]
+    High = np.minimum(np.maximum(B[i] + Sj,Aj),Bj)
+    np.minimum(np.maximum(A[i] + Sj,Aj),Bj,out=Aj)
+    Bj[...] = High
+    Sj += S[i]
+
+def SMBM_scan_kernel(DeltaR,ET,AWC,IWC,AW,DE,RET,Rech):
+    
+    """Same recursion as SMBM_cells_kernel computed as a parallel prefix scan over days
+    Inputs: same as SMBM_cells_kernel, each row (cell) may be a different cell or parameter set
+    Remarks: each day maps AW to min(max(AW + DeltaR, 0), AWC), a shift clamped to [Low, High]; two such maps compose
+    into another one (SMBM_scan_compose), so the maps from IWC to every day are the prefix compositions of the daily maps.
+    They are built by a work-efficient (Brent-Kung) scan: 2*log2(days) vectorized steps over all cells at once
+    and about 2*days compositions per cell, then D/E, RET and Rech follow with array arithmetic.
+    Shifts are summed in a tree instead of day by day, results agree with the recursion to about 1E-12 mm
+    """
+    
+    NumDays = DeltaR.shape[1]
+    S = np.array(DeltaR.T,order='C') # Copy with days x cells, each day is a contiguous row
+    A = np.zeros(S.shape)
+    B = np.zeros(S.shape) + AWC
+    
+    ## Up-sweep: the map at day 2k-1 of each step covers the k days before it
+    k = 1
+    while k < NumDays:
+        SMBM_scan_compose(S,A,B,slice(k-1,NumDays-k,2*k),slice(2*k-1,NumDays,2*k))
+        k *= 2
+    
+    ## Down-sweep: remaining days are completed from the nearest covered day before them
+    k //= 2
+    while k >= 1:
+        SMBM_scan_compose(S,A,B,slice(2*k-1,NumDays-k,2*k),slice(3*k-1,NumDays,2*k))
+        k //= 2
+    
+    AW[:] = np.minimum(np.maximum(IWC + S,A),B).T
+    
+    Prev = np.concatenate([IWC[:,np.newaxis],AW[:,:-1]],axis=1)
+    DE[:] = DeltaR + Prev - AW
+    RET[:] = np.where(DE > 0, ET, ET + DE)
+    Rech[:] = np.where(DE > 0, DE, 0)
+    
+    return(AW)
+
+if numba is not None:
+    
+    # Compiled on first call, signatures are cached on disk so later sessions skip compilation
+    SMBM_kernel_jit = numba.njit(cache=True)(SMBM_kernel)
+    
+    @numba.njit(parallel=True, cache=True)
+    def SMBM_cells_kernel_jit(DeltaR,ET,AWC,IWC,AW,DE,RET,Rech):
+        
+        """Compiled SMBM_kernel run in parallel over cells, same arguments as SMBM_cells_kernel
+        """
+        
+        for c in numba.prange(DeltaR.shape[0]):
+            SMBM_kernel_jit(DeltaR[c],ET[c],AWC[c],IWC[c],AW[c],DE[c],RET[c],Rech[c])
+        
+        return(AW)
+
+SMBMColumns = ['AW','D/E','RET','Rech'] # Daily variables of the bucket recursion, in kernel order
+SMBMTotalColumns = SMBMColumns + ['NatRech','Runoff'] # Variables which can be accumulated as totals, in kernel order
+
+def SMBM_totals_kernel(DeltaR,ET,AWC,IWC,Inputs,MWC,Cf,SlotCol,SlotFreq,Codes,Tot):
+    
+    """Bucket recursion for a single soil column accumulating period totals instead of daily series
+    Inputs: DeltaR and ET as 1D arrays (mm), AWC and IWC (mm), rainfall and pumping (Inputs, mm), MWC (mm)
+    and RF coefficient (Cf) as 1D arrays for NatRech and Runoff, index in SMBMTotalColumns (SlotCol) and frequency (SlotFreq) 
+    of each total, period numbers Codes (frequencies x days) and preallocated Tot (slots x periods) filled in place
+    """
+    
+    prev = IWC
+    Day = np.zeros(6)
+    
+    for d in range(len(DeltaR)):
+        
+        Day[0] = min(max(prev + DeltaR[d],0.0),AWC)
+        Day[1] = DeltaR[d] + prev - Day[0]
+        if Day[1] > 0:
+            Day[2] = ET[d]
+            Day[3] = Day[1]
+        else:
+            Day[2] = ET[d] + Day[1]
+            Day[3] = 0.0
+        Day[4] = Cf[d]*Day[3]
+        if Inputs[d] <= MWC:
+            Day[5] = 0.0
+        else:
+            Day[5] = Inputs[d] - MWC
+        prev = Day[0]
+        
+        for k in range(len(SlotCol)):
+            Tot[k,Codes[SlotFreq[k],d]] += Day[SlotCol[k]]
+    
+    return(Tot)
+
+def SMBM_cells_totals_kernel(DeltaR,ET,AWC,IWC,Inputs,MWC,Cf,SlotCol,SlotFreq,Codes,Tot):
+    
+    """Same as SMBM_totals_kernel advancing all cells in lockstep
+    Inputs: DeltaR, ET, Inputs and Cf as (cells x days) arrays, AWC, IWC and MWC vectors (cells), 
+    slots and Codes as in SMBM_totals_kernel, preallocated Tot (cells x slots x periods) filled in place
+    """
+    
+    prev = IWC
+    
+    for d in range(DeltaR.shape[1]):
+        AW = np.where(prev + DeltaR[:,d] > AWC, AWC, np.where(prev + DeltaR[:,d] < 0, 0, prev + DeltaR[:,d]))
+        DE = DeltaR[:,d] + prev - AW
+        Rech = np.where(DE > 0, DE, 0)
+        Day = [AW, DE, np.where(DE > 0, ET[:,d], ET[:,d] + DE), Rech, Cf[:,d]*Rech, np.where(Inputs[:,d] <= MWC, 0.0, Inputs[:,d] - MWC)]
+        for k in range(len(SlotCol)):
+            Tot[:,k,Codes[SlotFreq[k],d]] += Day[SlotCol[k]]
+        prev = AW
+    
+    return(Tot)
+
+if numba is not None:
+    
+    SMBM_totals_kernel_jit = numba.njit(cache=True)(SMBM_totals_kernel)
+    
+    @numba.njit(parallel=True, cache=True)
+    def SMBM_cells_totals_kernel_jit(DeltaR,ET,AWC,IWC,Inputs,MWC,Cf,SlotCol,SlotFreq,Codes,Tot):
+        
+        """Compiled SMBM_totals_kernel run in parallel over cells, same arguments as SMBM_cells_totals_kernel
+        """
+        
+        for c in numba.prange(DeltaR.shape[0]):
+            SMBM_totals_kernel_jit(DeltaR[c],ET[c],AWC[c],IWC[c],Inputs[c],MWC[c],Cf[c],SlotCol,SlotFreq,Codes,Tot[c])
+        
+        return(Tot)
+
+def SMBM_run(DeltaR,ET,AWC,IWC,Totals=None,Dates=None,Inputs=None,MWC=None,Cf=None):
+    
+    """Runs the bucket recursion with the selected backend
+    Inputs: DeltaR and ET as (days) or (days x cells) arrays (mm), AWC and IWC as scalars or vectors (cells),
+    IWC may be 'periodic' for the periodic equilibrium of the first 365 days (see SMBM_iwc_fun),
+    optional totals to accumulate as a dictionary {frequency: columns of SMBMTotalColumns} with frequencies 'A', 'M' or 'S' 
+    (see Calendar_def) and the daily dates of the run; totals of NatRech need the RF coefficient Cf 
+    and totals of Runoff the rainfall and pumping (Inputs) and MWC, with the same shapes as DeltaR and AWC
+    Outputs: AW, D/E, RET and Rech arrays with the same shape as DeltaR; 
+    if Totals is given, a dictionary {frequency: {column: (periods x cells) DataFrame}} instead, no daily series is kept
+    """
+    
+    DeltaR = np.asarray(DeltaR,dtype=float)
+    Shape = DeltaR.shape
+    DeltaR = np.ascontiguousarray(DeltaR.reshape(Shape[0],-1).T) # cells x days
+    ET = np.ascontiguousarray(np.asarray(ET,dtype=float).reshape(Shape[0],-1).T)
+    NumCells = DeltaR.shape[0]
+    AWC = np.array(np.broadcast_to(np.asarray(AWC,dtype=float),(NumCells,)))
+    if isinstance(IWC,str) and (IWC == 'periodic'):
+        IWC = SMBM_iwc_fun(DeltaR[:,:365].T,AWC)
+    IWC = np.array(np.broadcast_to(np.asarray(IWC,dtype=float),(NumCells,)))
+    
+    if Totals is not None:
+        Freqs = sorted(Totals.keys())
+        Codes, Labels = Periods_fun(Dates,Freqs)
+        Slots = [(f,Freq,col) for f, Freq in enumerate(Freqs) for col in Totals[Freq]]
+        SlotCol = np.array([SMBMTotalColumns.index(col) for f, Freq, col in Slots],dtype=np.int64)
+        SlotFreq = np.array([f for f, Freq, col in Slots],dtype=np.int64)
+        Tot = np.zeros((NumCells,len(Slots),max([len(l) for l in Labels] + [1])))
+        if (Cf is None) & any(col == 'NatRech' for f, Freq, col in Slots):
+            raise ValueError("Totals of NatRech need the RF coefficient Cf")
+        if ((Inputs is None) | (MWC is None)) & any(col == 'Runoff' for f, Freq, col in Slots):
+            raise ValueError("Totals of Runoff need Inputs and MWC")
+        ## Unused forcing is a read-only array without memory (never summed)
+        Inputs = np.broadcast_to(np.nan,DeltaR.shape) if Inputs is None else np.ascontiguousarray(np.asarray(Inputs,dtype=float).reshape(Shape[0],-1).T)
+        Cf = np.broadcast_to(np.nan,DeltaR.shape) if Cf is None else np.ascontiguousarray(np.asarray(Cf,dtype=float).reshape(Shape[0],-1).T)
+        MWC = np.array(np.broadcast_to(np.asarray(np.nan if MWC is None else MWC,dtype=float),(NumCells,)))
+        if SMBMBackend == 'numba':
+            SMBM_cells_totals_kernel_jit(DeltaR,ET,AWC,IWC,Inputs,MWC,Cf,SlotCol,SlotFreq,Codes,Tot)
+        elif SMBMBackend == 'scan': # Daily arrays of the scan summed per period, one matrix product per total
+            Day = [np.zeros(DeltaR.shape) for k in range(4)]
+            SMBM_scan_kernel(DeltaR,ET,AWC,IWC,*Day)
+            Day += [Cf*Day[3], np.where(Inputs <= MWC[:,np.newaxis], 0.0, Inputs - MWC[:,np.newaxis])]
+            Sum = [np.equal.outer(np.arange(Tot.shape[2]),Codes[f]).astype(float) for f in range(len(Freqs))] # periods x days
+            for k in range(len(SlotCol)):
+                Tot[:,k] = np.dot(Day[SlotCol[k]],Sum[SlotFreq[k]].T)
+        elif NumCells < 16: # Plain loop is faster than masked arrays for a few cells
+            for c in range(NumCells):
+                SMBM_totals_kernel(DeltaR[c],ET[c],AWC[c],IWC[c],Inputs[c],MWC[c],Cf[c],SlotCol,SlotFreq,Codes,Tot[c])
+        else:
+            SMBM_cells_totals_kernel(DeltaR,ET,AWC,IWC,Inputs,MWC,Cf,SlotCol,SlotFreq,Codes,Tot)
+        Out = dict((Freq,{}) for Freq in Freqs)
+        for k, (f,Freq,col) in enumerate(Slots):
+            Out[Freq][col] = pd.DataFrame(Tot[:,k,:len(Labels[f])].T,index=Labels[f])
+        return(Out)
+    
+    AW, DE, RET, Rech = [np.zeros(DeltaR.shape) for k in range(4)]
+    if SMBMBackend == 'numba':
+        SMBM_cells_kernel_jit(DeltaR,ET,AWC,IWC,AW,DE,RET,Rech)
+    elif SMBMBackend == 'scan':
+        SMBM_scan_kernel(DeltaR,ET,AWC,IWC,AW,DE,RET,Rech)
+    elif NumCells < 16: # Plain loop is faster than masked arrays for a few cells
+        for c in range(NumCells):
+            SMBM_kernel(DeltaR[c],ET[c],AWC[c],IWC[c],AW[c],DE[c],RET[c],Rech[c])
+    else:
+        SMBM_cells_kernel(DeltaR,ET,AWC,IWC,AW,DE,RET,Rech)
+    
+    return([X.T.reshape(Shape) for X in (AW,DE,RET,Rech)])
+
+#####################################
+#####    PERIODIC EQUILIBRIUM   #####
+#####################################
+
+def SMBM_iwc_fun(DeltaR,AWC,IWC=0):
+    
+    """Periodic-equilibrium Initial Water Content: AW at the end of the reference period equal to IWC
+    Inputs: DeltaR of the reference period (usually one year) as (days) or (days x cells) array (mm), AWC (scalar or vector),
+    IWC used where any value is periodic (no net stock variation and no clamping)
+    Outputs: IWC vector (cells)
+    Remarks: one day of the bucket maps AW to min(max(AW + DeltaR, 0), AWC); the composition of such maps over the period
+    is again a shift s clamped to [a, b], so the fixed point is b if s > 0, a if s < 0, found in a single pass over all cells
+    """
+    
+    DeltaR = np.asarray(DeltaR,dtype=float)
+    DeltaR = DeltaR.reshape(DeltaR.shape[0],-1)
+    AWC = np.broadcast_to(np.asarray(AWC,dtype=float),(DeltaR.shape[1],))
+    
+    Shift = DeltaR.sum(axis=0)
+    Low = np.zeros(DeltaR.shape[1]) - np.inf
+    High = np.zeros(DeltaR.shape[1]) + np.inf
+    for d in range(DeltaR.shape[0]):
+        Low = np.clip(Low + DeltaR[d],0,AWC)
+        High = np.clip(High + DeltaR[d],0,AWC)
+    
+    return(np.where(Shift > 0, High, np.where(Shift < 0, Low, np.clip(IWC,Low,High))))
+
+def SMBM_periodic_fun(DeltaR,ET,AWC,Dates,RefYear,Totals=None,Inputs=None,MWC=None,Cf=None):
+    
+    """Bucket run started from the periodic equilibrium of a reference year
+    Inputs: DeltaR and ET as (days) or (days x cells) arrays (mm) with their daily dates, AWC (scalar or vector), 
+    reference year, optional totals with their Inputs, MWC and Cf (see SMBM_run)
+    Outputs: IWC vector and SMBM_run outputs from the first day of the reference year on (earlier days are dropped)
+    """
+    
+    Dates = pd.DatetimeIndex(pd.to_datetime(Dates))
+    Keep = np.asarray(Dates.year >= RefYear)
+    DeltaR = np.asarray(DeltaR,dtype=float)[Keep]
+    ET = np.asarray(ET,dtype=float)[Keep]
+    if Inputs is not None:
+        Inputs = np.asarray(Inputs,dtype=float)[Keep]
+    if Cf is not None:
+        Cf = np.asarray(Cf,dtype=float)[Keep]
+    
+    IWC = SMBM_iwc_fun(DeltaR[np.asarray(Dates[Keep].year == RefYear)],AWC)
+    
+    return(IWC,SMBM_run(DeltaR,ET,AWC,IWC,Totals=Totals,Dates=Dates[Keep],Inputs=Inputs,MWC=MWC,Cf=Cf))
+
+################################
+#####    SINGLE FUNCTION   #####
+################################
+
+SMBMInputCache = {} # Forcing already read, keyed by absolute file paths and modification times
+
+def SMBM_inputs_fun(ClimateFile="INPUT_climate_2002-2015.txt",RechFile="INPUT_ref-rech_2002-2015.txt",Cache=SMBMInputCache):
+    
+    """Forcing of SMBM_fun, read once per version of the input files
+    Inputs: climate file (daily Rainfall_mm and PET_mm), reference recharge file (yearly, per grid cell),
+    dictionary of forcing already read (None to always read the files)
+    Outputs: dictionary with Dates, Rainfall and PET (float arrays, mm), RechYearly (reference recharge table)
+    and Hash (hash of the daily forcing, used by SMBM_cached_fun)
+    Remarks: the files are parsed again only when their modification time changes. 
+    Arrays are shared by all calls and therefore read-only
+    """
+    
+    Paths = tuple(os.path.abspath(f) for f in (ClimateFile,RechFile))
+    Key = (Paths,tuple(os.path.getmtime(f) for f in Paths))
+    if Cache is not None and Key in Cache:
+        return(Cache[Key])
+    
+    # REFERENCE RECHARGE
+    InputRechYearly = pd.read_csv(RechFile,sep='\t',header=0,index_col=0) 
+    
+    ## INPUT CLIMATE DATA
+    InputClimate = pd.read_csv(ClimateFile,sep='\t',header=0,index_col=0)
+    
+    Inputs = {'Dates': pd.DatetimeIndex(pd.to_datetime(InputClimate.index)), 'RechYearly': InputRechYearly,
+              'Rainfall': np.array(InputClimate["Rainfall_mm"],dtype=float), 'PET': np.array(InputClimate["PET_mm"],dtype=float)}
+    Inputs['Rainfall'].flags.writeable = False
+    Inputs['PET'].flags.writeable = False
+    Inputs['Hash'] = hashlib.sha1(Inputs['Rainfall'].tobytes() + Inputs['PET'].tobytes()).hexdigest()
+    
+    if Cache is not None:
+        for k in [k for k in Cache if k[0] == Paths]: # Older versions of the same files
+            del Cache[k]
+        Cache[Key] = Inputs
+    
+    return(Inputs)
+
+def SMBM_fun(IWC,MWC,AWC,Inputs=None):
+    
+    """Model which calculates Soil Moisture Balance for a single soil type
+    Inputs: Initial Water Content (IWC), Maximum surface storage (MWC) and Available Water Content (AWC),
+    forcing from SMBM_inputs_fun (default: read from the default files through the input cache)
+    """
+    
+    if Inputs is None:
+        Inputs = SMBM_inputs_fun()
+    
+    InputRechYearly = Inputs['RechYearly']
+    Dates = Inputs['Dates']
+    Rainfall = Inputs['Rainfall']
+    PET = Inputs['PET']
+   
+    ## Stock Variations
+    DeltaR = np.where(Rainfall>=MWC, MWC - PET, Rainfall - PET)
+        
+    ## Available Water, excess or deficit, real evaporation and recharge
+    AW, DE, RET, Rech = SMBM_run(DeltaR,PET,AWC,IWC)
+    
+    # Output table, built once from float arrays
+    SMBMTab = pd.DataFrame(np.column_stack([DeltaR,AW,DE,RET,Rech]),index=Dates, columns=[["DeltaR","AW","D/E","RET","Rech"]])
+    
+    SMBMTabYearly = SMBMTab["Rech"].resample("A").sum()
+        
+    SMBMTabYearly.index = SMBMTabYearly.index.year
+    Err=np.sqrt(((InputRechYearly - SMBMTabYearly) ** 2).mean())
+    
+    return SMBMTab, Err
+
+def SMBM_cache_new(MaxSize=256,Quantum=None):
+    
+    """Empty result cache for SMBM_cached_fun
+    Inputs: maximum number of runs kept (least recently used ones are dropped first), 
+    optional step (mm) to which AWC, MWC and IWC are rounded before running
+    Outputs: dictionary with the runs (Runs) and the numbers of Hits and Misses
+    Remarks: rounding makes nearby parameters share a run, a step larger than the finite-difference step 
+    of the optimizer flattens its gradient
+    """
+    
+    return({'Runs': OrderedDict(), 'MaxSize': MaxSize, 'Quantum': Quantum, 'Hits': 0, 'Misses': 0})
+
+def SMBM_cached_fun(IWC,MWC,AWC,Inputs=None,Cache=None):
+    
+    """Daily recharge (Rech) of SMBM_fun through a bounded least-recently-used cache
+    Inputs: as SMBM_fun, cache from SMBM_cache_new (None to always run)
+    Outputs: daily recharge table, shared with the cache and therefore not to be modified
+    """
+    
+    if Inputs is None:
+        Inputs = SMBM_inputs_fun()
+    if Cache is None:
+        return(SMBM_fun(IWC,MWC,AWC,Inputs)[0]['Rech'])
+    
+    Q = Cache['Quantum']
+    if Q:
+        AWC = round(AWC/float(Q))*Q
+        MWC = round(MWC/float(Q))*Q
+        if not isinstance(IWC,str):
+            IWC = round(IWC/float(Q))*Q
+    Key = (float(AWC), float(MWC), IWC if isinstance(IWC,str) else float(IWC), Inputs['Hash'])
+    
+    Runs = Cache['Runs']
+    if Key in Runs:
+        Cache['Hits'] += 1
+        Runs[Key] = Runs.pop(Key) # Most recently used last
+    else:
+        Cache['Misses'] += 1
+        Runs[Key] = SMBM_fun(IWC,MWC,AWC,Inputs)[0]['Rech']
+        if len(Runs) > Cache['MaxSize']:
+            Runs.popitem(last=False)
+    
+    return(Runs[Key])
+
+####################################
+#####    AGGREGATED FUNCTION   #####
+####################################
+
+def SMBMSoilType_fun(InputSoilAWC,InputSoilMWC,IWC, InputSoilType, SMBMSoilType, InputRechYearly, Inputs=None):
+
+    """Model run which aggregates Soil Moisture Balance for different soil types
+    Inputs: array of AWCs and MWCs (must be same length), Initial Water Content (IWC), 
+    Soil Type percentages per grid cell (InputSoilType), initialized table with correct colnames (SMBMSoilType),
+    Reference recharge at each grid cell per year (InputRechYearly), forcing from SMBM_inputs_fun (see SMBM_fun)
+    """
+
+    ## Obtain recharge for each soil type
+    for c in SMBMSoilType.columns:
+        AWC = InputSoilAWC['SoilAWC'][c]
+        MWC = InputSoilMWC['SoilMWC'][c]
+        SMBMSoilType[c] = SMBM_fun(IWC,MWC,AWC,Inputs)[0]['Rech']
+        print(c)
+
+    ## Obtain for each grid cell using soil type percentages
+    SMBMDiscr = Mix_fun(Mix_weights_fun(InputSoilType,SMBMSoilType.columns),SMBMSoilType) # Discretized model
+
+    SMBMDiscrYearly = SMBMDiscr.resample("A").sum().transpose() # Yearly average
+    SMBMDiscrYearly.columns = SMBMDiscrYearly.columns.year
+
+    ## Error calculation
+    ErrTab = pd.DataFrame(0,index=InputRechYearly.index, columns=InputRechYearly.columns)
+
+    for y in InputRechYearly.columns:
+        ErrTab[str(y)] = (SMBMDiscrYearly[int(y)]-InputRechYearly[str(y)])
+
+    ErrTabAv = np.mean(ErrTab,axis=0)
+    ErrTabTot = np.sum(ErrTabAv,axis=0)
+
+    print('done')
+
+    return (SMBMDiscrYearly,ErrTab,ErrTabTot)
+
+#################################
+#####    CORRECT FUNCTION   #####
+#################################
+
+
+def SMBM_Cell_fun(gr, AWC, MWC, IWC, InputTotal, InputRET, InputCf, InputRechYearly):
+    
+    """Model which calculates Soil Moisture Balance for a single grid cell considering pumping and return flow
+    Inputs: Obtained from SMBM_Inputs
+    Outputs: SMBM for all period for grid cell, yearly values and error compared to obs
+    """
+
+    Dates = InputTotal.index
+    InputsCell = np.asarray(InputTotal[gr],dtype=float) # Rainfall and pumping
+    RETCell = np.asarray(InputRET[gr].reindex(Dates),dtype=float) # Real evapotranspiration
+    CfCell = np.asarray(InputCf[gr].reindex(Dates),dtype=float) # RF Coef
+   
+    ## Stock Variations
+    DeltaR = np.where(InputsCell>=MWC, MWC - RETCell, InputsCell - RETCell)
+    Runoff = np.where(InputsCell<=MWC, 0.0, InputsCell - MWC)
+        
+    ## Available Water, excess or deficit, real evaporation and recharge
+    AW, DE, RET, TotRech = SMBM_run(DeltaR,RETCell,AWC,IWC)
+    
+    ## Partition natural recharge from recharge flow with RF Coef (Cf)
+    NatRech = CfCell*TotRech
+    
+    # Output table, built once from float arrays
+    SMBMTabCell = pd.DataFrame(np.column_stack([DeltaR,AW,DE,RET,TotRech,NatRech,Runoff]),index=Dates, 
+                               columns=[["DeltaR","AW","D/E","RET","TotRech","NatRech","Runoff"]])
+    
+    ## Yearly values
+    #Sim
+    SMBMRechCellYearly = pd.DataFrame(pd.Series(NatRech,index=Dates).resample("A").sum())
+    SMBMRechCellYearly.index = SMBMRechCellYearly.index.year
+    SMBMRechCellYearly.columns = ['RechCalc']
+    #Obs
+    RefRechCellYearly = pd.DataFrame(InputRechYearly[gr])
+    RefRechCellYearly.columns = ['RechObs']
+    
+    RechCellYearly = RefRechCellYearly.join(SMBMRechCellYearly)
+    
+    # Error calculation   
+    Err = np.sqrt(((RechCellYearly['RechCalc'][0:] - RechCellYearly['RechObs'][0:]) ** 2).mean())
+
+    return SMBMTabCell, Err, RechCellYearly
+
+def SMBM_Cells_fun(AWC, MWC, IWC, InputTotal, InputRET, InputCf, InputRechYearly, Daily=True):
+    
+    """SMBM_Cell_fun for many grid cells at once
+    Inputs: AWC and MWC as Series indexed by grid cell (the cells to run), IWC as a value, a Series or 'periodic' (see SMBM_run),
+    (days x cells) tables InputTotal, InputRET and InputCf and (years x cells) InputRechYearly obtained from SMBM_Inputs,
+    Daily=False to skip the daily tables
+    Outputs: dictionary of (days x cells) DataFrames NatRech, TotRech and Runoff (only if Daily), 
+    (years x cells) yearly NatRech (RechCalc), dictionary Yearly of (years x cells) NatRech, TotRech and Runoff
+    and RMSE on yearly natural recharge per cell (Err)
+    Remarks: yearly values are accumulated by the bucket recursion (see SMBM_run), daily series are only built for the tables
+    """
+    
+    Cells = pd.Index(AWC.index)
+    Dates = InputTotal.index
+    InputsCells = np.asarray(InputTotal[Cells],dtype=float) # Rainfall and pumping
+    RETCells = np.asarray(InputRET[Cells].reindex(Dates),dtype=float) # Real evapotranspiration
+    CfCells = np.asarray(InputCf[Cells].reindex(Dates),dtype=float) # RF Coef
+    AWC = np.asarray(AWC,dtype=float)
+    MWC = np.asarray(pd.Series(MWC).reindex(Cells),dtype=float)
+    if isinstance(IWC,pd.Series):
+        IWC = IWC.reindex(Cells)
+    
+    ## Stock Variations
+    DeltaR = np.where(InputsCells>=MWC, MWC - RETCells, InputsCells - RETCells)
+    if isinstance(IWC,str) and (IWC == 'periodic'): # Computed once for both runs
+        IWC = SMBM_iwc_fun(DeltaR[:365],AWC)
+    
+    ## Yearly total and natural recharge (partitioned with RF Coef Cf) and runoff
+    Totals = SMBM_run(DeltaR,RETCells,AWC,IWC,Totals={'A': ['Rech','NatRech','Runoff']},Dates=Dates,
+                      Inputs=InputsCells,MWC=MWC,Cf=CfCells)['A']
+    Yearly = {'NatRech': Totals['NatRech'], 'TotRech': Totals['Rech'], 'Runoff': Totals['Runoff']}
+    for k in Yearly:
+        Yearly[k].columns = Cells
+    RechCalc = Yearly['NatRech']
+    
+    # Error calculation, on the years of the reference recharge
+    RechObs = InputRechYearly[Cells]
+    Err = np.sqrt(((RechCalc.reindex(RechObs.index) - RechObs) ** 2).mean())
+    
+    Out = {'RechCalc': RechCalc, 'Yearly': Yearly, 'Err': Err}
+    
+    if Daily: # Available Water, excess or deficit, real evaporation and recharge
+        AW, DE, RET, TotRech = SMBM_run(DeltaR,RETCells,AWC,IWC)
+        Runoff = np.where(InputsCells<=MWC, 0.0, InputsCells - MWC)
+        Out['NatRech'] = pd.DataFrame(CfCells*TotRech,index=Dates,columns=Cells)
+        Out['TotRech'] = pd.DataFrame(TotRech,index=Dates,columns=Cells)
+        Out['Runoff'] = pd.DataFrame(Runoff,index=Dates,columns=Cells)
+    
+    return(Out)
+
+##########################
+#####    GRADIENTS   #####
+##########################
+
+def SMBM_grad_kernel(Inputs,ET,AWC,MWC,IWC,Periodic,Rech,dRech):
+    
+    """Bucket recursion of SMBM_Cell_fun for a single grid cell carrying derivatives with respect to AWC and MWC (forward mode)
+    Inputs: rainfall and pumping (Inputs) and ET as 1D arrays (mm), AWC, MWC and IWC (mm), Periodic: IWC is the periodic
+    equilibrium of the first 365 days (its derivatives are then included), preallocated Rech (days) and dRech (2 x days) 
+    filled in place with recharge and its derivatives [dRech/dAWC, dRech/dMWC]
+    Remarks: a periodic IWC is found again at the end of the year after at least one clamping, so its derivatives are 
+    those of AW on day 365 of a first pass started with zero derivatives
+    """
+    
+    dAWC0 = 0.0
+    dMWC0 = 0.0
+    
+    for Pass in range(0 if Periodic else 1,2):
+        
+        prev = IWC
+        dAWC = dAWC0
+        dMWC = dMWC0
+        
+        for d in range(min(365,len(Inputs)) if Pass == 0 else len(Inputs)):
+            
+            ## Stock Variations
+            if Inputs[d] >= MWC:
+                x = prev + MWC - ET[d]
+                dx = dMWC + 1.0
+            else:
+                x = prev + Inputs[d] - ET[d]
+                dx = dMWC
+            
+            ## Available Water, excess and recharge
+            if x > AWC:
+                AW = AWC
+                Rech[d] = x - AWC
+                dRech[0,d] = dAWC - 1.0
+                dRech[1,d] = dx
+                dAWC = 1.0
+                dMWC = 0.0
+            else:
+                AW = max(x,0.0)
+                Rech[d] = 0.0
+                dRech[0,d] = 0.0
+                dRech[1,d] = 0.0
+                if x < 0:
+                    dAWC = 0.0
+                    dMWC = 0.0
+                else:
+                    dMWC = dx
+            
+            prev = AW
+        
+        dAWC0 = dAWC
+        dMWC0 = dMWC
+    
+    return(Rech)
+
+if numba is not None:
+    
+    SMBM_grad_kernel_jit = numba.njit(cache=True)(SMBM_grad_kernel)
+    
+    @numba.njit(parallel=True, cache=True)
+    def SMBM_cells_grad_kernel_jit(Inputs,ET,AWC,MWC,IWC,Periodic,Rech,dRech):
+        
+        """Compiled SMBM_grad_kernel run in parallel over cells, arrays as (cells x ...) stacks
+        """
+        
+        for c in numba.prange(Inputs.shape[0]):
+            SMBM_grad_kernel_jit(Inputs[c],ET[c],AWC[c],MWC[c],IWC[c],Periodic,Rech[c],dRech[c])
+        
+        return(Rech)
+
+def SMBM_grad_fun(AWC,MWC,IWC,Inputs,ET,Cf,Codes,RechObs):
+    
+    """RMSE on yearly natural recharge of SMBM_Cell_fun and its derivatives with respect to AWC and MWC
+    Inputs: AWC and MWC (scalars or vectors (cells)), IWC (value, vector or 'periodic'), 
+    rainfall and pumping (Inputs), ET and Cf as (days) or (days x cells) arrays, year number of each day (Codes, see Period_fun),
+    (years) or (years x cells) reference recharge aligned on these years with NaN for missing years
+    Outputs: RMSE (cells) and (cells x 2) derivatives [dRMSE/dAWC, dRMSE/dMWC]
+    Remarks: the model is piecewise linear in AWC and MWC, derivatives are exact except on the kinks 
+    (AW + DeltaR exactly 0 or AWC, Inputs exactly MWC) where the one-sided derivative of the branch taken is returned
+    """
+    
+    NumDays = np.shape(Inputs)[0]
+    Inputs = np.ascontiguousarray(np.asarray(Inputs,dtype=float).reshape(NumDays,-1).T) # cells x days
+    NumCells = Inputs.shape[0]
+    ET = np.ascontiguousarray(np.broadcast_to(np.asarray(ET,dtype=float).reshape(NumDays,-1).T,Inputs.shape))
+    Cf = np.broadcast_to(np.asarray(Cf,dtype=float).reshape(NumDays,-1).T,Inputs.shape)
+    RechObs = np.broadcast_to(np.asarray(RechObs,dtype=float).reshape(len(RechObs),-1).T,(NumCells,len(RechObs)))
+    AWC = np.array(np.broadcast_to(np.asarray(AWC,dtype=float),(NumCells,)))
+    MWC = np.array(np.broadcast_to(np.asarray(MWC,dtype=float),(NumCells,)))
+    
+    Periodic = isinstance(IWC,str) and (IWC == 'periodic')
+    if Periodic:
+        DeltaR = np.where(Inputs[:,:365] >= MWC[:,np.newaxis], MWC[:,np.newaxis], Inputs[:,:365]) - ET[:,:365]
+        IWC = SMBM_iwc_fun(DeltaR.T,AWC)
+    IWC = np.array(np.broadcast_to(np.asarray(IWC,dtype=float),(NumCells,)))
+    
+    Rech = np.zeros(Inputs.shape)
+    dRech = np.zeros((NumCells,2,NumDays))
+    if SMBMBackend == 'numba':
+        SMBM_cells_grad_kernel_jit(Inputs,ET,AWC,MWC,IWC,Periodic,Rech,dRech)
+    else:
+        for c in range(NumCells):
+            SMBM_grad_kernel(Inputs[c],ET[c],AWC[c],MWC[c],IWC[c],Periodic,Rech[c],dRech[c])
+    
+    ## Yearly natural recharge and its derivatives
+    Calc = np.zeros((NumCells,RechObs.shape[1]))
+    dCalc = np.zeros((NumCells,2,RechObs.shape[1]))
+    np.add.at(Calc.T,Codes,(Cf*Rech).T)
+    np.add.at(dCalc.T,Codes,(Cf[:,np.newaxis,:]*dRech).T)
+    
+    # Error calculation on the years with reference recharge
+    Res = np.where(np.isnan(RechObs), 0, Calc - RechObs)
+    NumYears = (~np.isnan(RechObs)).sum(axis=1)
+    Err = np.sqrt((Res**2).sum(axis=1)/NumYears)
+    Grad = (Res[:,np.newaxis,:]*dCalc).sum(axis=2)/(NumYears*np.where(Err > 0, Err, np.inf))[:,np.newaxis]
+    
+    return(Err,Grad)
+
+def SMBM_Cells_grad_fun(AWC, MWC, IWC, InputTotal, InputRET, InputCf, InputRechYearly):
+    
+    """RMSE per grid cell of SMBM_Cells_fun and its derivatives with respect to AWC and MWC
+    Inputs: same as SMBM_Cells_fun
+    Outputs: RMSE (Series) and derivatives (cells x ['AWC','MWC'] DataFrame)
+    """
+    
+    Cells = pd.Index(AWC.index)
+    Dates = InputTotal.index
+    Codes, Years = Period_fun(Dates,'A')
+    if isinstance(IWC,pd.Series):
+        IWC = IWC.reindex(Cells)
+    
+    Err, Grad = SMBM_grad_fun(np.asarray(AWC,dtype=float), np.asarray(pd.Series(MWC).reindex(Cells),dtype=float), IWC,
+                              np.asarray(InputTotal[Cells],dtype=float), np.asarray(InputRET[Cells].reindex(Dates),dtype=float),
+                              np.asarray(InputCf[Cells].reindex(Dates),dtype=float), Codes, 
+                              np.asarray(InputRechYearly[Cells].reindex(Years),dtype=float))
+    
+    return(pd.Series(Err,index=Cells),pd.DataFrame(Grad,index=Cells,columns=['AWC','MWC']))
+
+############################
+#####    CALIBRATION   #####
+############################
+
+SMBMCalibData = {} # Forcing and settings of the calibration, set once in each worker process
+
+def SMBM_calib_init(Data):
+    
+    """Stores the calibration data in the worker process (pool initializer)
+    """
+    
+    SMBMCalibData.clear()
+    SMBMCalibData.update(Data)
+
+def SMBM_calib_cell(c):
+    
+    """Calibrates AWC and MWC of one grid cell (column c of the calibration data) with L-BFGS-B and analytic gradients
+    Outputs: column number, AWC, MWC and RMSE
+    """
+    
+    D = SMBMCalibData
+    Args = (D['IWC'], D['Inputs'][:,c], D['ET'][:,c], D['Cf'][:,c], D['Codes'], D['RechObs'][:,c])
+    Fun = lambda x: [v[0] for v in SMBM_grad_fun(x[0],x[1],*Args)]
+    res = minimize(Fun, D['x0'][c], method='L-BFGS-B', jac=True, bounds=D['Bounds'], options=D['Options'])
+    
+    return(c,res.x[0],res.x[1],float(res.fun))
+
+def SMBM_calib_fun(Cells, IWC, InputTotal, InputRET, InputCf, InputRechYearly, ResultsFile, 
+                   x0=(200,20), Bounds=((5,600),(5,600)), Options=None, NumProcs=None):
+    
+    """Cell-by-cell calibration of AWC and MWC minimizing the RMSE on yearly natural recharge, spread over a process pool
+    Inputs: cells to calibrate, IWC (value or 'periodic'), tables as in SMBM_Cells_fun, results file, 
+    start point of [AWC, MWC] (one for all cells or a DataFrame with AWC and MWC columns per cell, e.g. from SMBM_grid_best), bounds, L-BFGS-B options, number of processes (default: all cores, 1 to run in this process)
+    Outputs: AWC, MWC and Err per calibrated cell (DataFrame read from ResultsFile, including cells of earlier runs)
+    Remarks: each finished cell is appended to ResultsFile (tab separated) and cells already in it are skipped, 
+    so an interrupted calibration resumes where it stopped. The first line of ResultsFile holds the settings (IWC, bounds,
+    start point and options), a file written with other settings is not resumed. 
+    Forcing is sent once to each worker and only read there.
+    On Windows the calling script must run the calibration under if __name__ == '__main__'
+    """
+    
+    if minimize is None:
+        raise ImportError("scipy is required for the calibration")
+    if Options is None:
+        Options = {'maxiter': 50, 'disp': False, 'maxls': 15}
+    
+    ## Settings of the run, first line of ResultsFile
+    if isinstance(x0,pd.DataFrame):
+        x0 = x0[['AWC','MWC']].copy()
+        x0.index = x0.index.astype(str)
+        x0Text = 'per cell ' + hashlib.sha1(np.asarray(x0.reindex([str(gr) for gr in Cells]),dtype=float).tobytes()).hexdigest()[:12]
+    else:
+        x0Text = ','.join(['%.12g' % v for v in np.ravel(x0)])
+    Settings = '# IWC=%s; Bounds=%s; x0=%s; Options=%s' % (IWC if isinstance(IWC,str) else '%.12g' % IWC,
+                                                          ','.join(['None' if v is None else '%.12g' % v for b in Bounds for v in b]),
+                                                          x0Text, ','.join(['%s=%s' % kv for kv in sorted(Options.items())]))
+    
+    ## Cells already calibrated
+    if os.path.exists(ResultsFile) and os.path.getsize(ResultsFile) > 0:
+        with open(ResultsFile) as f:
+            Text = f.read()
+        if Text.split('\n',1)[0] != Settings:
+            raise ValueError("%s was written with other settings (%s instead of %s), use another results file or remove it" 
+                             % (ResultsFile,Text.split('\n',1)[0],Settings))
+        NewLine = not Text.endswith('\n') # Last line cut by a crash, that cell is run again
+        Done = pd.read_csv(ResultsFile,sep='\t',header=0,index_col=0,skiprows=1)
+        Done = Done[:len(Done) - NewLine].dropna()
+        Done = Done[~Done.index.duplicated(keep='last')] # Cells run again after a cut line
+    else:
+        Done = pd.DataFrame(columns=['AWC','MWC','Err'], dtype=float)
+        with open(ResultsFile,'w') as f:
+            f.write(Settings + '\nCell\tAWC\tMWC\tErr\n')
+        NewLine = False
+    DoneCells = set(Done.index.astype(str))
+    Todo = [gr for gr in Cells if str(gr) not in DoneCells]
+    
+    if len(Todo) > 0:
+        
+        Dates = InputTotal.index
+        Codes, Years = Period_fun(Dates,'A')
+        Data = {'Inputs': np.asarray(InputTotal[Todo],dtype=float), 'ET': np.asarray(InputRET[Todo].reindex(Dates),dtype=float),
+                'Cf': np.asarray(InputCf[Todo].reindex(Dates),dtype=float), 'Codes': Codes,
+                'RechObs': np.asarray(InputRechYearly[Todo].reindex(Years),dtype=float),
+                'IWC': IWC, 'Bounds': Bounds, 'Options': Options}
+        if isinstance(x0,pd.DataFrame):
+            x0 = x0.loc[[str(gr) for gr in Todo]]
+        Data['x0'] = np.array(np.broadcast_to(np.asarray(x0,dtype=float),(len(Todo),2)))
+        for k in ['Inputs','ET','Cf','RechObs']:
+            Data[k].flags.writeable = False
+        
+        Pool = None
+        if NumProcs == 1:
+            SMBM_calib_init(Data)
+            Results = (SMBM_calib_cell(c) for c in range(len(Todo))) # Lazy on Python 2 as well, each cell is saved before the next one starts
+        else:
+            Pool = multiprocessing.Pool(NumProcs,SMBM_calib_init,(Data,))
+            Results = Pool.imap_unordered(SMBM_calib_cell,range(len(Todo)))
+        
+        try:
+            with open(ResultsFile,'a') as f:
+                if NewLine:
+                    f.write('\n')
+                for c, AWC, MWC, Err in Results:
+                    f.write('%s\t%.12g\t%.12g\t%.12g\n' % (Todo[c],AWC,MWC,Err))
+                    f.flush() # Saved as soon as the cell is done
+                    print(Todo[c])
+        finally:
+            if Pool is not None:
+                Pool.terminate()
+                Pool.join()
+    
+    Done = pd.read_csv(ResultsFile,sep='\t',header=0,index_col=0,skiprows=1).dropna()
+    
+    return(Done[~Done.index.duplicated(keep='last')])
+
+def SMBM_grid_fun(AWCGrid, MWCGrid, IWC, InputTotal, InputRET, InputCf, InputRechYearly, Cells=None):
+    
+    """RMSE on yearly natural recharge of every grid cell over an AWC x MWC lattice
+    Inputs: AWC and MWC values of the lattice, IWC (value or 'periodic'), tables as in SMBM_Cells_fun, 
+    cells to evaluate (default: all cells with reference recharge)
+    Outputs: (cells x nodes) DataFrame of RMSE with (AWC, MWC) columns
+    Remarks: one batched SMBM_run per MWC value covers all cells (by blocks of 256) and AWC values; 
+    yearly sums are a product with the (years x days) calendar matrix
+    """
+    
+    if Cells is None:
+        Cells = InputRechYearly.columns
+    Cells = pd.Index(Cells)
+    if len(Cells) > 256: # Bounded memory on large grids
+        return(pd.concat([SMBM_grid_fun(AWCGrid,MWCGrid,IWC,InputTotal,InputRET,InputCf,InputRechYearly,Cells[i:i+256]) 
+                          for i in range(0,len(Cells),256)]))
+    Dates = InputTotal.index
+    Codes, Years = Period_fun(Dates,'A')
+    YearMat = (Codes[np.newaxis,:] == np.arange(len(Years))[:,np.newaxis]).astype(float)
+    
+    InputsCells = np.ascontiguousarray(np.asarray(InputTotal[Cells],dtype=float).T) # cells x days
+    RETCells = np.ascontiguousarray(np.asarray(InputRET[Cells].reindex(Dates),dtype=float).T)
+    CfCells = np.asarray(InputCf[Cells].reindex(Dates),dtype=float).T
+    RechObs = np.asarray(InputRechYearly[Cells].reindex(Years),dtype=float).T # cells x years
+    Valid = ~np.isnan(RechObs)
+    
+    AWCGrid = np.asarray(AWCGrid,dtype=float)
+    NumAWC = len(AWCGrid)
+    ET = np.repeat(RETCells,NumAWC,axis=0) # Runs ordered by cell then AWC value, days last so that no copy is made in SMBM_run
+    Surface = np.zeros((len(Cells),NumAWC,len(MWCGrid)))
+    
+    for k, MWC in enumerate(MWCGrid):
+        
+        DeltaR = np.repeat(np.where(InputsCells>=MWC, MWC - RETCells, InputsCells - RETCells),NumAWC,axis=0)
+        TotRech = SMBM_run(DeltaR.T,ET.T,np.tile(AWCGrid,len(Cells)),IWC)[3].T.reshape(len(Cells),NumAWC,-1)
+        
+        RechCalc = (CfCells[:,np.newaxis,:]*TotRech).dot(YearMat.T) # cells x AWC values x years
+        Res = np.where(Valid[:,np.newaxis,:], RechCalc - np.where(Valid,RechObs,0)[:,np.newaxis,:], 0)
+        Surface[:,:,k] = np.sqrt((Res**2).sum(axis=2)/Valid.sum(axis=1)[:,np.newaxis])
+    
+    return(pd.DataFrame(Surface.reshape(len(Cells),-1),index=Cells,
+                        columns=pd.MultiIndex.from_product([AWCGrid,np.asarray(MWCGrid,dtype=float)],names=['AWC','MWC'])))
+
+def SMBM_grid_best(Surface):
+    
+    """Best lattice node of each grid cell
+    Inputs: RMSE surface from SMBM_grid_fun
+    Outputs: (cells x ['AWC','MWC','Err']) DataFrame, usable as start points of SMBM_calib_fun
+    """
+    
+    Best = np.argmin(np.where(np.isnan(Surface.values), np.inf, Surface.values),axis=1)
+    Nodes = np.array(Surface.columns.tolist())[Best]
+    
+    return(pd.DataFrame({'AWC': Nodes[:,0], 'MWC': Nodes[:,1], 'Err': Surface.values[np.arange(len(Best)),Best]},
+                        index=Surface.index,columns=['AWC','MWC','Err']))